@@ -1,5 +1,9 @@
+import asyncio
+import httpx
 import openai
-from typing import Dict, List, Optional, Any
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, AsyncIterator, Tuple
 from datetime import datetime
 import json
 import logging
@@ -9,239 +13,523 @@ from config import Config
 
 logger = logging.getLogger(__name__)
 
+# Single AsyncOpenAI client shared by every engine instance. Creating a client
+# per instance would rebuild the underlying httpx connection pool each time;
+# one shared client keeps connections warm across all cooking sessions.
+_async_client: Optional[openai.AsyncOpenAI] = None
+
+# Static system prompt shared by every recipe and session. Keeping this
+# byte-identical across calls means the provider's automatic prefix caching
+# hits on every request after the first; all per-turn state goes in a
+# separate context message instead.
+_STATIC_SYSTEM_PROMPT = """You are an AI cooking assistant guiding someone through a recipe.
+
+Your personality:
+- Friendly, encouraging, and patient
+- Understand that cooking is messy and unpredictable
+- Handle interruptions gracefully
+- Adapt to the user's pace
+- Provide helpful tips and encouragement
+
+Key behaviors:
+1. ALWAYS be supportive when things go wrong (spills, burns, dropped food)
+2. Pause intelligently when the user needs time
+3. Provide context when resuming after interruptions
+4. Give clear, actionable guidance
+5. Don't rush the user - let them work at their own pace
+6. Offer alternatives when ingredients are missing or things go wrong
+
+Use the cooking_action function to:
+- "pause": When user needs to stop/handle something
+- "resume": When user is ready to continue
+- "next_step": When current step is complete
+- "repeat_step": When user wants to hear instructions again
+- "go_back": When user wants to return to previous step
+- "complete_recipe": When all steps are done
+- "none": For general conversation/questions
+
+Always provide a warm, conversational response along with any action."""
+
+# Matches the "action" value inside the streamed tool-call arguments so
+# the action can be surfaced before the full JSON finishes arriving
+_ACTION_RE = re.compile(r'"action"\s*:\s*"([a-z_]+)"')
+
+
+class _ResponseFieldStream:
+    """Incrementally extracts the "response" string from streamed tool
+    arguments.
+
+    With tool_choice forced to cooking_action the model puts all of its
+    text inside the tool-call JSON and delta.content stays empty, so the
+    conversational reply has to be pulled out of the arguments buffer as
+    it accumulates — same trick _ACTION_RE plays for the action value,
+    but stateful because the string spans many chunks. feed() takes the
+    full buffer so far and returns whatever new decoded text is safely
+    complete, holding back escape sequences that are split mid-chunk.
+    """
+
+    _KEY_RE = re.compile(r'"response"\s*:\s*"')
+
+    def __init__(self):
+        self._consumed = None  # buffer offset of the next unread char
+        self._done = False
+
+    def feed(self, buffer: str) -> str:
+        if self._done:
+            return ""
+        if self._consumed is None:
+            match = self._KEY_RE.search(buffer)
+            if not match:
+                return ""
+            self._consumed = match.end()
+
+        i = self._consumed
+        n = len(buffer)
+        while i < n:
+            ch = buffer[i]
+            if ch == '\\':
+                # Hold back an escape split across chunks
+                esc_len = 6 if buffer[i + 1:i + 2] == 'u' else 2
+                if i + esc_len > n:
+                    break
+                i += esc_len
+            elif ch == '"':
+                self._done = True
+                break
+            else:
+                i += 1
+
+        raw = buffer[self._consumed:i]
+        self._consumed = i
+        if not raw:
+            return ""
+        try:
+            return json.loads(f'"{raw}"')
+        except json.JSONDecodeError:
+            return raw
+
+# Tool schema sent with every completion, defined once instead of being
+# rebuilt per call. Forcing tool_choice to cooking_action means the model
+# never spends output tokens deciding whether to call it.
+COOKING_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "cooking_action",
+            "description": "Take a cooking-related action",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "action": {
+                        "type": "string",
+                        "enum": ["pause", "resume", "next_step", "repeat_step", "go_back", "complete_recipe", "none"]
+                    },
+                    "response": {
+                        "type": "string",
+                        "description": "The conversational response to the user"
+                    },
+                    "context_updates": {
+                        "type": "object",
+                        "description": "Updates to the cooking session context"
+                    }
+                },
+                "required": ["action", "response"]
+            }
+        }
+    }
+]
+
+COOKING_TOOL_CHOICE = {"type": "function", "function": {"name": "cooking_action"}}
+
+# Pre-compiled template for the per-turn state block; format_map against a
+# small dict is cheaper than re-evaluating a multi-part f-string each turn
+_CONTEXT_TMPL = (
+    "Current step: {step}\n"
+    "Step status: {status}"
+    "{interruptions}{extra}"
+)
+
+# Maximum number of cached (recipe, step, status, utterance) responses
+_RESPONSE_CACHE_SIZE = 10_000
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+
+def _normalize_utterance(text: str) -> str:
+    """Normalize user input for cache lookups: lowercase, strip punctuation,
+    collapse whitespace"""
+    return _WHITESPACE_RE.sub(" ", _PUNCTUATION_RE.sub("", text.lower())).strip()
+
+# Per-recipe prompt prefixes. Recipe facts never change during a session, so
+# serializing them once per recipe keeps the message bytes stable and lets
+# the provider cache them as part of the prompt prefix.
+_recipe_prefix_cache: Dict[str, str] = {}
+
+def _recipe_prefix(recipe: Recipe) -> str:
+    """Serialize the immutable facts of a recipe into a stable prompt block"""
+    cached = _recipe_prefix_cache.get(recipe.id)
+    if cached is not None:
+        return cached
+
+    lines = [
+        f"Recipe: {recipe.name}",
+        f"Description: {recipe.description}",
+        f"Total steps: {recipe.step_count}",
+        "",
+        "Steps:"
+    ]
+    for step in recipe.steps:
+        lines.append(f"{step.step_number}. {step.instruction}")
+        if step.estimated_time:
+            lines.append(f"   Estimated time: {step.estimated_time} seconds")
+        if step.tips:
+            lines.append(f"   Tips: {', '.join(step.tips)}")
+
+    prefix = "\n".join(lines)
+    _recipe_prefix_cache[recipe.id] = prefix
+    return prefix
+
+# Shared HTTP/2 pool behind the OpenAI client. Streaming keeps each
+# request's socket busy for seconds, so multiplexing many completions over
+# a few warm connections beats the default per-request pool.
+_http_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get (or lazily create) the shared HTTP/2 connection pool"""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(30, connect=5),
+            limits=httpx.Limits(max_connections=128, max_keepalive_connections=64)
+        )
+    return _http_client
+
+def get_async_client() -> openai.AsyncOpenAI:
+    """Get (or lazily create) the shared AsyncOpenAI client"""
+    global _async_client
+    if _async_client is None:
+        _async_client = openai.AsyncOpenAI(
+            api_key=Config.OPENAI_API_KEY,
+            http_client=get_http_client()
+        )
+    return _async_client
+
+async def close_async_client():
+    """Close the shared client and its HTTP pool (call on app shutdown)"""
+    global _async_client, _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    _async_client = None
+
+# Caps in-flight OpenAI calls across all sessions so concurrent WebSocket
+# traffic queues here instead of blowing through the account rate limit
+_openai_semaphore: Optional[asyncio.Semaphore] = None
+
+def _get_openai_semaphore() -> asyncio.Semaphore:
+    global _openai_semaphore
+    if _openai_semaphore is None:
+        _openai_semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_OPENAI)
+    return _openai_semaphore
+
 class ConversationEngine:
     """
     The brain of the cooking assistant. Handles all AI-powered conversation,
     context management, and intelligent responses during cooking.
     """
-    
+
     def __init__(self):
-        self.client = openai.OpenAI(api_key=Config.OPENAI_API_KEY)
-        
-    def generate_response(
-        self, 
-        user_input: str, 
-        session: CookingSession, 
+        self.client = get_async_client()
+
+        # Exact-match LRU of parsed responses keyed by the cooking state and
+        # normalized utterance. Fixed-intent phrases ("next step", "repeat
+        # that") recur constantly, and a hit skips the OpenAI call entirely.
+        self._response_cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+
+    def _cache_key(self, user_input: str, session: CookingSession, recipe: Recipe) -> Tuple:
+        return (
+            recipe.id,
+            session.current_step,
+            session.step_status,
+            _normalize_utterance(user_input)
+        )
+
+    def _cache_get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        result = self._response_cache.get(key)
+        if result is not None:
+            self._response_cache.move_to_end(key)
+        return result
+
+    def _cache_put(self, key: Tuple, result: Dict[str, Any]):
+        self._response_cache[key] = result
+        self._response_cache.move_to_end(key)
+        while len(self._response_cache) > _RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+
+    async def generate_response(
+        self,
+        user_input: str,
+        session: CookingSession,
         recipe: Recipe
     ) -> Dict[str, Any]:
         """
         Generate an intelligent response based on user input and cooking context.
-        
+
         Returns:
             Dict containing:
             - response: The AI's text response
             - action: Any action to take (pause, resume, next_step, etc.)
             - context_updates: Updates to session context
         """
-        
+
+        result = None
+        async for event in self.stream_response(user_input, session, recipe):
+            if event["type"] == "done":
+                result = event["result"]
+        return result
+
+    async def stream_response(
+        self,
+        user_input: str,
+        session: CookingSession,
+        recipe: Recipe
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a response token by token so callers can forward deltas as
+        they arrive instead of waiting for the full completion.
+
+        Yields:
+            {"type": "delta", "text": ...} for each content token,
+            {"type": "action", "action": ...} as soon as the action value
+            closes in the streamed function_call arguments, then
+            {"type": "done", "result": ...} with the parsed response dict
+        """
+
+        # Serve repeated utterances for the same cooking state from cache
+        # without paying for an LLM round-trip
+        cache_key = self._cache_key(user_input, session, recipe)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            result = dict(cached)
+            session.conversation_history.append({
+                "role": "user",
+                "content": user_input
+            })
+            session.conversation_history.append({
+                "role": "assistant",
+                "content": result["response"]
+            })
+            if result["response"]:
+                yield {"type": "delta", "text": result["response"]}
+            yield {"type": "done", "result": result}
+            return
+
         # Build context for the AI
         context = self._build_context(session, recipe)
-        
-        # Create the system prompt
-        system_prompt = self._create_system_prompt(recipe, session)
-        
-        # Build conversation history
+
+        # Order messages so the longest stable prefix comes first: the static
+        # system prompt, then the per-recipe facts block, then per-turn
+        # state, then history, then the latest user input
         messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"Context: {context}\n\nUser says: {user_input}"}
+            {"role": "system", "content": self._create_system_prompt()},
+            {"role": "system", "content": _recipe_prefix(recipe)},
+            {"role": "system", "content": f"Current cooking state:\n{context}"}
         ]
-        
+
         # Add recent conversation history
-        for msg in session.conversation_history[-5:]:  # Last 5 messages for context
+        for msg in session.recent(5):  # Last 5 messages for context
             messages.append(msg)
-        
+
+        messages.append({"role": "user", "content": user_input})
+
         try:
-            # Call OpenAI API
-            response = self.client.chat.completions.create(
-                model=Config.AI_MODEL,
-                messages=messages,
-                temperature=Config.AI_TEMPERATURE,
-                max_tokens=Config.MAX_TOKENS,
-                functions=[
-                    {
-                        "name": "cooking_action",
-                        "description": "Take a cooking-related action",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "action": {
-                                    "type": "string",
-                                    "enum": ["pause", "resume", "next_step", "repeat_step", "go_back", "complete_recipe", "none"]
-                                },
-                                "response": {
-                                    "type": "string",
-                                    "description": "The conversational response to the user"
-                                },
-                                "context_updates": {
-                                    "type": "object",
-                                    "description": "Updates to the cooking session context"
-                                }
-                            },
-                            "required": ["action", "response"]
-                        }
-                    }
-                ],
-                function_call="auto"
+            # Queue on the shared semaphore so total in-flight OpenAI calls
+            # stay bounded
+            async with _get_openai_semaphore():
+                # Call OpenAI API and stream the completion
+                stream = await self.client.chat.completions.create(
+                    model=Config.AI_MODEL,
+                    messages=messages,
+                    temperature=Config.AI_TEMPERATURE,
+                    max_tokens=Config.MAX_TOKENS,
+                    tools=COOKING_TOOLS,
+                    tool_choice=COOKING_TOOL_CHOICE,
+                    stream=True
+                )
+
+                content_parts = []
+                function_args_parts = []
+                action_emitted = False
+                response_stream = _ResponseFieldStream()
+
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta
+
+                    if delta.tool_calls:
+                        for tool_call in delta.tool_calls:
+                            if tool_call.function and tool_call.function.arguments:
+                                function_args_parts.append(tool_call.function.arguments)
+
+                        args_buffer = "".join(function_args_parts)
+
+                        # Emit the action as soon as its value closes instead of
+                        # waiting for the whole arguments object to stream in
+                        if not action_emitted:
+                            match = _ACTION_RE.search(args_buffer)
+                            if match:
+                                action_emitted = True
+                                yield {"type": "action", "action": match.group(1)}
+
+                        # The forced tool choice means the model streams its
+                        # text inside the arguments JSON, never as content;
+                        # surface the "response" value as deltas while it's
+                        # still arriving
+                        fragment = response_stream.feed(args_buffer)
+                        if fragment:
+                            yield {"type": "delta", "text": fragment}
+
+                    if delta.content:
+                        content_parts.append(delta.content)
+                        yield {"type": "delta", "text": delta.content}
+
+            # Parse the accumulated response
+            result = self._parse_streamed_response(
+                "".join(content_parts),
+                "".join(function_args_parts)
             )
-            
-            # Parse the response
-            result = self._parse_ai_response(response)
-            
+
             # Update conversation history
             session.conversation_history.append({
-                "role": "user", 
+                "role": "user",
                 "content": user_input
             })
             session.conversation_history.append({
-                "role": "assistant", 
+                "role": "assistant",
                 "content": result["response"]
             })
-            
-            return result
-            
+
+            self._cache_put(cache_key, dict(result))
+
+            yield {"type": "done", "result": result}
+
         except Exception as e:
             logger.error(f"Error generating AI response: {e}")
-            return {
-                "response": "I'm sorry, I had trouble understanding that. Could you try again?",
-                "action": "none",
-                "context_updates": {}
+            yield {
+                "type": "done",
+                "result": {
+                    "response": "I'm sorry, I had trouble understanding that. Could you try again?",
+                    "action": "none",
+                    "context_updates": {},
+                    # Mark transient failures so callers don't cache the apology
+                    "error": True
+                }
             }
-    
+
     def _build_context(self, session: CookingSession, recipe: Recipe) -> str:
-        """Build a context string for the AI about the current cooking state"""
-        
-        current_step = session.get_current_step(recipe)
-        context_parts = []
-        
-        # Recipe info
-        context_parts.append(f"Recipe: {recipe.name}")
-        context_parts.append(f"Total steps: {len(recipe.steps)}")
-        
-        # Current progress
-        context_parts.append(f"Current step: {session.current_step + 1}")
-        context_parts.append(f"Step status: {session.step_status}")
-        
-        if current_step:
-            context_parts.append(f"Current instruction: {current_step.instruction}")
-            if current_step.estimated_time:
-                context_parts.append(f"Estimated time: {current_step.estimated_time} seconds")
-        
-        # Recent interruptions
-        recent_interruptions = [i for i in session.interruptions if not i.resolved]
-        if recent_interruptions:
-            context_parts.append("Active interruptions:")
-            for interruption in recent_interruptions[-3:]:
-                context_parts.append(f"- {interruption.type}: {interruption.reason}")
-        
+        """
+        Build a context string for the mutable cooking state.
+
+        Recipe facts live in the cached _recipe_prefix block; only the
+        per-turn delta (progress, interruptions, session context) goes here.
+        """
+
+        # Recent interruptions (the active list only holds unresolved ones)
+        interruptions = ""
+        unresolved = session.active_interruptions
+        if unresolved:
+            interruptions = "\nActive interruptions:\n" + "\n".join(
+                f"- {i.type}: {i.reason}" for i in unresolved[-3:]
+            )
+
         # Session context
+        extra_context = ""
         if session.context:
-            context_parts.append("Session context:")
-            for key, value in session.context.items():
-                context_parts.append(f"- {key}: {value}")
-        
-        return "\n".join(context_parts)
-    
-    def _create_system_prompt(self, recipe: Recipe, session: CookingSession) -> str:
-        """Create the system prompt that defines the AI's behavior"""
-        
-        return f"""You are an AI cooking assistant helping someone cook {recipe.name}. 
-
-Your personality:
-- Friendly, encouraging, and patient
-- Understand that cooking is messy and unpredictable
-- Handle interruptions gracefully
-- Adapt to the user's pace
-- Provide helpful tips and encouragement
+            extra_context = "\nSession context:\n" + "\n".join(
+                f"- {key}: {value}" for key, value in session.context.items()
+            )
 
-Key behaviors:
-1. ALWAYS be supportive when things go wrong (spills, burns, dropped food)
-2. Pause intelligently when the user needs time
-3. Provide context when resuming after interruptions
-4. Give clear, actionable guidance
-5. Don't rush the user - let them work at their own pace
-6. Offer alternatives when ingredients are missing or things go wrong
+        # This runs on every LLM turn; the template is compiled once at
+        # module load
+        return _CONTEXT_TMPL.format_map({
+            "step": session.current_step + 1,
+            "status": session.step_status,
+            "interruptions": interruptions,
+            "extra": extra_context
+        })
 
-Current cooking context:
-- Recipe: {recipe.name}
-- Step {session.current_step + 1} of {len(recipe.steps)}
-- Status: {session.step_status}
+    def _create_system_prompt(self) -> str:
+        """Return the static system prompt that defines the AI's behavior"""
+        return _STATIC_SYSTEM_PROMPT
 
-Use the cooking_action function to:
-- "pause": When user needs to stop/handle something
-- "resume": When user is ready to continue
-- "next_step": When current step is complete
-- "repeat_step": When user wants to hear instructions again
-- "go_back": When user wants to return to previous step
-- "complete_recipe": When all steps are done
-- "none": For general conversation/questions
+    def _parse_streamed_response(self, content: str, function_args: str) -> Dict[str, Any]:
+        """Parse the accumulated streamed response and extract action + response"""
 
-Always provide a warm, conversational response along with any action."""
-    
-    def _parse_ai_response(self, response) -> Dict[str, Any]:
-        """Parse the AI response and extract action + response"""
-        
         # Check if AI used function calling
-        if response.choices[0].message.function_call:
+        if function_args:
             try:
-                function_args = json.loads(response.choices[0].message.function_call.arguments)
+                parsed = json.loads(function_args)
                 return {
-                    "response": function_args.get("response", ""),
-                    "action": function_args.get("action", "none"),
-                    "context_updates": function_args.get("context_updates", {})
+                    "response": parsed.get("response", ""),
+                    "action": parsed.get("action", "none"),
+                    "context_updates": parsed.get("context_updates", {})
                 }
             except json.JSONDecodeError:
                 pass
-        
+
         # Fallback to regular message
         return {
-            "response": response.choices[0].message.content,
+            "response": content,
             "action": "none",
             "context_updates": {}
         }
-    
-    def generate_step_introduction(self, session: CookingSession, recipe: Recipe) -> str:
+
+    async def generate_step_introduction(self, session: CookingSession, recipe: Recipe) -> str:
         """Generate an introduction for a new step"""
-        
+
         current_step = session.get_current_step(recipe)
         if not current_step:
             return "We've completed all the steps! Great job cooking!"
-        
+
         step_num = session.current_step + 1
-        total_steps = len(recipe.steps)
-        
+        total_steps = recipe.step_count
+
         # Build context about what we've done and what's next
         context = f"""
         We're on step {step_num} of {total_steps} for {recipe.name}.
         Current step: {current_step.instruction}
         """
-        
+
         if current_step.estimated_time:
             context += f"\nThis should take about {current_step.estimated_time // 60} minutes."
-        
+
         if current_step.tips:
             context += f"\nTips: {', '.join(current_step.tips)}"
-        
+
         messages = [
             {
-                "role": "system", 
+                "role": "system",
                 "content": "You are a cooking assistant. Introduce the next step in a friendly, encouraging way. Keep it concise but helpful."
             },
             {
-                "role": "user", 
+                "role": "user",
                 "content": context
             }
         ]
-        
+
         try:
-            response = self.client.chat.completions.create(
-                model=Config.AI_MODEL,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=150
-            )
-            
+            async with _get_openai_semaphore():
+                response = await self.client.chat.completions.create(
+                    model=Config.AI_MODEL,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=150
+                )
+
             return response.choices[0].message.content
-            
+
         except Exception as e:
             logger.error(f"Error generating step introduction: {e}")
-            return f"Step {step_num}: {current_step.instruction}" 
\ No newline at end of file
+            return f"Step {step_num}: {current_step.instruction}"
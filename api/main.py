@@ -1,15 +1,26 @@
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
+import asyncio
 import logging
-import json
+import orjson
 
 from config import Config
 from services.cooking_service import CookingService
-from data.sample_recipes import get_recipe, SAMPLE_RECIPES
+from data.sample_recipes import get_recipe, SAMPLE_RECIPES, RECIPES_SUMMARY, RECIPE_JSON
 from models import InterruptionType
 
+# Delta batching: the first token is flushed immediately for TTFT, then
+# tokens accumulate until a sentence boundary (TTS-friendly) or the cap
+SENTENCE_BREAKS = (". ", "? ", "! ", "\n")
+MAX_DELTA_CHARS = 80
+
+def _dumps(payload) -> str:
+    """Serialize WebSocket frames with orjson (called per streamed token)"""
+    return orjson.dumps(payload).decode()
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -36,6 +47,12 @@ app.add_middleware(
 # Initialize services
 cooking_service = CookingService()
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the shared OpenAI HTTP pool cleanly"""
+    from ai.conversation_engine import close_async_client
+    await close_async_client()
+
 # Request/Response models
 class StartCookingRequest(BaseModel):
     recipe_id: str
@@ -62,29 +79,18 @@ async def root():
 @app.get("/recipes")
 async def list_recipes():
     """List all available recipes"""
-    return {
-        "recipes": [
-            {
-                "id": recipe.id,
-                "name": recipe.name,
-                "description": recipe.description,
-                "difficulty": recipe.difficulty,
-                "prep_time": recipe.prep_time,
-                "cook_time": recipe.cook_time,
-                "servings": recipe.servings
-            }
-            for recipe in SAMPLE_RECIPES.values()
-        ]
-    }
+    return {"recipes": RECIPES_SUMMARY}
 
 @app.get("/recipes/{recipe_id}")
 async def get_recipe_details(recipe_id: str):
     """Get detailed information about a specific recipe"""
-    recipe = get_recipe(recipe_id)
-    if not recipe:
+    recipe_json = RECIPE_JSON.get(recipe_id)
+    if not recipe_json:
         raise HTTPException(status_code=404, detail="Recipe not found")
-    
-    return recipe
+
+    # Serve the bytes serialized at import time; skips Pydantic encoding
+    # and jsonable_encoder on every request
+    return Response(content=recipe_json, media_type="application/json")
 
 @app.post("/cooking/start")
 async def start_cooking(request: StartCookingRequest):
@@ -94,7 +100,11 @@ async def start_cooking(request: StartCookingRequest):
         raise HTTPException(status_code=404, detail="Recipe not found")
     
     session = cooking_service.start_cooking_session(recipe, request.user_id)
-    
+
+    # Warm the first-turn LLM response in the background so it's ready by
+    # the time the user says "let's start"
+    asyncio.create_task(cooking_service.prewarm(session, recipe))
+
     # Generate welcome message
     welcome_message = f"""
     Great! Let's cook {recipe.name} together. This recipe serves {recipe.servings} and should take about {recipe.prep_time + recipe.cook_time} minutes total.
@@ -108,7 +118,7 @@ async def start_cooking(request: StartCookingRequest):
             "id": recipe.id,
             "name": recipe.name,
             "description": recipe.description,
-            "total_steps": len(recipe.steps),
+            "total_steps": recipe.step_count,
             "estimated_total_time": recipe.prep_time + recipe.cook_time
         },
         "welcome_message": welcome_message.strip(),
@@ -122,7 +132,7 @@ async def process_user_input(request: UserInputRequest):
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found")
     
-    result = cooking_service.process_user_input(
+    result = await cooking_service.process_user_input(
         session_id=request.session_id,
         user_input=request.user_input,
         recipe=recipe
@@ -140,7 +150,7 @@ async def get_cooking_status(session_id: str, recipe_id: str):
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found")
     
-    status = cooking_service.get_cooking_status(session_id, recipe)
+    status = await cooking_service.get_cooking_status(session_id, recipe)
     
     if "error" in status:
         raise HTTPException(status_code=404, detail=status["error"])
@@ -155,7 +165,7 @@ async def handle_interruption(request: InterruptionRequest):
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid interruption type")
     
-    result = cooking_service.handle_interruption(
+    result = await cooking_service.handle_interruption(
         session_id=request.session_id,
         interruption_type=interruption_type,
         reason=request.reason,
@@ -170,7 +180,7 @@ async def handle_interruption(request: InterruptionRequest):
 @app.delete("/cooking/{session_id}")
 async def end_cooking_session(session_id: str):
     """End a cooking session"""
-    success = cooking_service.end_session(session_id)
+    success = await cooking_service.end_session(session_id)
     
     if not success:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -187,35 +197,63 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
         while True:
             # Receive message from client
             data = await websocket.receive_text()
-            message = json.loads(data)
+            message = orjson.loads(data)
             
             if message["type"] == "user_input":
                 # Process user input
                 recipe = get_recipe(message["recipe_id"])
                 if not recipe:
-                    await websocket.send_text(json.dumps({
+                    await websocket.send_text(_dumps({
                         "type": "error",
                         "message": "Recipe not found"
                     }))
                     continue
                 
-                result = cooking_service.process_user_input(
+                # Forward tokens to the client as they arrive instead of
+                # waiting for the full completion. The first delta goes out
+                # immediately; later ones batch to phrase-sized frames.
+                buf = ""
+                first_sent = False
+                async for frame in cooking_service.stream_user_input(
                     session_id=session_id,
                     user_input=message["input"],
                     recipe=recipe
-                )
-                
-                await websocket.send_text(json.dumps({
-                    "type": "ai_response",
-                    "data": result
-                }))
+                ):
+                    if frame["type"] == "delta":
+                        buf += frame["text"]
+                        if not first_sent:
+                            first_sent = True
+                        elif len(buf) < MAX_DELTA_CHARS and not any(b in buf for b in SENTENCE_BREAKS):
+                            continue
+                        await websocket.send_text(_dumps({
+                            "type": "ai_delta",
+                            "text": buf
+                        }))
+                        buf = ""
+                    elif frame["type"] == "action":
+                        await websocket.send_text(_dumps({
+                            "type": "ai_action",
+                            "action": frame["action"]
+                        }))
+                    else:
+                        # Flush whatever is still buffered before finishing
+                        if buf:
+                            await websocket.send_text(_dumps({
+                                "type": "ai_delta",
+                                "text": buf
+                            }))
+                            buf = ""
+                        await websocket.send_text(_dumps({
+                            "type": "ai_done",
+                            "data": frame["result"]
+                        }))
                 
             elif message["type"] == "get_status":
                 # Get cooking status
                 recipe = get_recipe(message["recipe_id"])
                 if recipe:
-                    status = cooking_service.get_cooking_status(session_id, recipe)
-                    await websocket.send_text(json.dumps({
+                    status = await cooking_service.get_cooking_status(session_id, recipe)
+                    await websocket.send_text(_dumps({
                         "type": "status",
                         "data": status
                     }))
@@ -224,7 +262,7 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
         logger.info(f"WebSocket disconnected for session {session_id}")
     except Exception as e:
         logger.error(f"WebSocket error for session {session_id}: {e}")
-        await websocket.send_text(json.dumps({
+        await websocket.send_text(_dumps({
             "type": "error",
             "message": "An error occurred"
         }))
@@ -4,51 +4,46 @@ Helper script to kill any remaining voice demo processes
 """
 
 import os
-import subprocess
 import sys
 
+import psutil
+
+def is_voice_demo(cmdline):
+    """Check if a command line is a python voice demo (exact script match,
+    so this cleanup script never matches itself)"""
+    if not any('python' in os.path.basename(arg) for arg in cmdline):
+        return False
+    return any(os.path.basename(arg).startswith('voice_demo') for arg in cmdline)
+
 def kill_voice_demos():
     """Kill any running voice demo processes"""
     print("🔍 Looking for voice demo processes...")
-    
-    try:
-        # Find all python processes with voice_demo in the name
-        result = subprocess.run(
-            ['ps', 'aux'], 
-            capture_output=True, 
-            text=True
-        )
-        
-        killed_count = 0
-        
-        for line in result.stdout.split('\n'):
-            if 'python' in line and 'voice_demo' in line:
-                parts = line.split()
-                if len(parts) >= 2:
-                    pid = parts[1]
-                    process_name = ' '.join(parts[10:])
-                    
-                    print(f"🎯 Found: PID {pid} - {process_name}")
-                    
-                    try:
-                        # Kill the process
-                        os.kill(int(pid), 9)  # SIGKILL
-                        print(f"✅ Killed process {pid}")
-                        killed_count += 1
-                    except ProcessLookupError:
-                        print(f"⚠️  Process {pid} already terminated")
-                    except PermissionError:
-                        print(f"❌ Permission denied for process {pid}")
-                    except Exception as e:
-                        print(f"❌ Error killing {pid}: {e}")
-        
-        if killed_count == 0:
-            print("✅ No voice demo processes found")
-        else:
-            print(f"✅ Killed {killed_count} voice demo processes")
-            
-    except Exception as e:
-        print(f"❌ Error: {e}")
+
+    killed_count = 0
+
+    for proc in psutil.process_iter(['pid', 'cmdline']):
+        cmdline = proc.info['cmdline'] or []
+
+        if proc.info['pid'] == os.getpid() or not is_voice_demo(cmdline):
+            continue
+
+        print(f"🎯 Found: PID {proc.info['pid']} - {' '.join(cmdline)}")
+
+        try:
+            proc.kill()
+            print(f"✅ Killed process {proc.info['pid']}")
+            killed_count += 1
+        except psutil.NoSuchProcess:
+            print(f"⚠️  Process {proc.info['pid']} already terminated")
+        except psutil.AccessDenied:
+            print(f"❌ Permission denied for process {proc.info['pid']}")
+        except Exception as e:
+            print(f"❌ Error killing {proc.info['pid']}: {e}")
+
+    if killed_count == 0:
+        print("✅ No voice demo processes found")
+    else:
+        print(f"✅ Killed {killed_count} voice demo processes")
 
 if __name__ == "__main__":
-    kill_voice_demos() 
\ No newline at end of file
+    kill_voice_demos()
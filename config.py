@@ -6,6 +6,10 @@ load_dotenv()
 class Config:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+    SESSION_TTL = int(os.getenv("SESSION_TTL", 86400))  # seconds
+    # In-process session registry bounds; evicted sessions stay in Redis
+    MAX_ACTIVE_SESSIONS = int(os.getenv("MAX_ACTIVE_SESSIONS", 10000))
+    SESSION_IDLE_TIMEOUT = int(os.getenv("SESSION_IDLE_TIMEOUT", 7200))  # seconds
     DEBUG = os.getenv("DEBUG", "True").lower() == "true"
     HOST = os.getenv("HOST", "localhost")
     PORT = int(os.getenv("PORT", 8000))
@@ -14,6 +18,7 @@ class Config:
     AI_MODEL = "gpt-4"
     AI_TEMPERATURE = 0.7
     MAX_TOKENS = 500
+    MAX_CONCURRENT_OPENAI = int(os.getenv("MAX_CONCURRENT_OPENAI", 32))
     
     # Voice Configuration
     SPEECH_TIMEOUT = 5.0  # seconds
@@ -1,3 +1,4 @@
-from .sample_recipes import get_recipe, SAMPLE_RECIPES
+from .sample_recipes import get_recipe, SAMPLE_RECIPES, RECIPES_SUMMARY, RECIPE_JSON
+from .faq_seeds import load_faq_seeds
 
-__all__ = ["get_recipe", "SAMPLE_RECIPES"] 
\ No newline at end of file
+__all__ = ["get_recipe", "SAMPLE_RECIPES", "RECIPES_SUMMARY", "RECIPE_JSON", "load_faq_seeds"] 
\ No newline at end of file
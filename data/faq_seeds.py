@@ -0,0 +1,9 @@
+import json
+from pathlib import Path
+
+_SEEDS_PATH = Path(__file__).with_name("faq_seeds.json")
+
+def load_faq_seeds():
+    """Load the canonical utterances used to seed the semantic cache"""
+    with _SEEDS_PATH.open() as f:
+        return json.load(f)
@@ -99,6 +99,28 @@ SAMPLE_RECIPES = {
     "classic_beef_burger": BEEF_BURGER_RECIPE
 }
 
+# Catalog summary computed once at import time; the /recipes endpoint
+# returns this constant instead of walking Pydantic models per request
+RECIPES_SUMMARY = [
+    {
+        "id": recipe.id,
+        "name": recipe.name,
+        "description": recipe.description,
+        "difficulty": recipe.difficulty,
+        "prep_time": recipe.prep_time,
+        "cook_time": recipe.cook_time,
+        "servings": recipe.servings
+    }
+    for recipe in SAMPLE_RECIPES.values()
+]
+
+# Full recipe payloads serialized once at import time so endpoints can
+# return the bytes directly instead of re-encoding the model per request
+RECIPE_JSON = {
+    recipe_id: recipe.model_dump_json().encode()
+    for recipe_id, recipe in SAMPLE_RECIPES.items()
+}
+
 def get_recipe(recipe_id: str) -> Recipe:
     """Get a recipe by ID"""
     return SAMPLE_RECIPES.get(recipe_id) 
\ No newline at end of file
@@ -1,7 +1,13 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator, model_validator
+from typing import Deque, List, Optional, Dict, Any, Tuple
+from collections import deque
+from itertools import accumulate, islice
 from datetime import datetime
 from enum import Enum
+import time
+
+# Cap on retained conversation turns so long sessions stay bounded in memory
+MAX_CONVERSATION_MESSAGES = 50
 
 class StepStatus(str, Enum):
     PENDING = "pending"
@@ -18,6 +24,8 @@ class InterruptionType(str, Enum):
     TIMING_ISSUE = "timing_issue"
 
 class RecipeStep(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     step_number: int
     instruction: str
     estimated_time: Optional[int] = None  # in seconds
@@ -28,6 +36,8 @@ class RecipeStep(BaseModel):
     dependencies: List[int] = []  # step numbers that must be completed first
 
 class Ingredient(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str
     amount: str
     unit: Optional[str] = None
@@ -35,6 +45,10 @@ class Ingredient(BaseModel):
     substitutes: List[str] = []
 
 class Recipe(BaseModel):
+    # Recipes never change after load; freezing lets instances be shared
+    # safely across sessions and used as cache keys
+    model_config = ConfigDict(frozen=True)
+
     id: str
     name: str
     description: str
@@ -47,6 +61,65 @@ class Recipe(BaseModel):
     tags: List[str] = []
     nutrition: Optional[Dict[str, Any]] = None
 
+    # Step-derived values computed once at construction so per-turn code
+    # reads plain attributes instead of walking the step models
+    _step_count: int = PrivateAttr(default=0)
+    _cum_time: Tuple[int, ...] = PrivateAttr(default=())
+    _instructions: Tuple[str, ...] = PrivateAttr(default=())
+    _step_info: Tuple[Dict[str, Any], ...] = PrivateAttr(default=())
+    _intros: Tuple[str, ...] = PrivateAttr(default=())
+
+    @model_validator(mode="after")
+    def _index_steps(self):
+        self._step_count = len(self.steps)
+        self._cum_time = tuple(accumulate((s.estimated_time or 0) for s in self.steps))
+        self._instructions = tuple(s.instruction for s in self.steps)
+        self._step_info = tuple(
+            {
+                "instruction": s.instruction,
+                "estimated_time": s.estimated_time,
+                "tips": s.tips
+            }
+            for s in self.steps
+        )
+        self._intros = tuple(
+            f"Now for step {s.step_number}: {s.instruction}"
+            + (
+                f" This should take about {max(1, s.estimated_time // 60)} "
+                + ("minute." if s.estimated_time < 120 else "minutes.")
+                if s.estimated_time else ""
+            )
+            for s in self.steps
+        )
+        return self
+
+    @property
+    def step_count(self) -> int:
+        """Number of steps (precomputed at construction)"""
+        return self._step_count
+
+    @property
+    def last_step_idx(self) -> int:
+        """Index of the final step (precomputed at construction)"""
+        return self._step_count - 1
+
+    @property
+    def total_step_time(self) -> int:
+        """Sum of all step estimated times in seconds (precomputed)"""
+        return self._cum_time[-1] if self._cum_time else 0
+
+    @property
+    def step_info(self) -> Tuple[Dict[str, Any], ...]:
+        """Per-step response payloads built once at construction, shared by
+        reference instead of rebuilt on every turn"""
+        return self._step_info
+
+    @property
+    def step_intros(self) -> Tuple[str, ...]:
+        """Spoken introduction for each step, derived deterministically from
+        the recipe text at construction"""
+        return self._intros
+
 class CookingInterruption(BaseModel):
     type: InterruptionType
     reason: str
@@ -55,6 +128,30 @@ class CookingInterruption(BaseModel):
     user_message: Optional[str] = None
     resolved: bool = False
 
+    # Status payload and ISO timestamp memoized on first access; the
+    # timestamp never changes, so status polls reuse the same strings
+    # instead of re-running strftime-style formatting each time
+    _serialized: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+    _iso: Optional[str] = PrivateAttr(default=None)
+
+    @property
+    def iso(self) -> str:
+        """ISO-8601 form of the timestamp, formatted once"""
+        if self._iso is None:
+            self._iso = self.timestamp.isoformat()
+        return self._iso
+
+    @property
+    def serialized(self) -> Dict[str, Any]:
+        """Status-endpoint view of the interruption (cached)"""
+        if self._serialized is None:
+            self._serialized = {
+                "type": self.type.value,
+                "reason": self.reason,
+                "timestamp": self.iso
+            }
+        return self._serialized
+
 class CookingSession(BaseModel):
     session_id: str
     recipe_id: str
@@ -63,12 +160,76 @@ class CookingSession(BaseModel):
     step_status: StepStatus = StepStatus.PENDING
     started_at: datetime = Field(default_factory=datetime.now)
     context: Dict[str, Any] = {}
-    interruptions: List[CookingInterruption] = []
-    conversation_history: List[Dict[str, str]] = []
-    
+    # Interruptions split by state so status polls and prompt building walk
+    # only the (typically 0-1) active ones instead of the whole history
+    active_interruptions: List[CookingInterruption] = []
+    resolved_interruptions: List[CookingInterruption] = []
+    conversation_history: Deque[Dict[str, str]] = Field(
+        default_factory=lambda: deque(maxlen=MAX_CONVERSATION_MESSAGES)
+    )
+
+    # Last-activity clock used by the service to evict idle sessions from
+    # the in-process registry (they remain recoverable from Redis)
+    _last_touched: float = PrivateAttr(default_factory=time.time)
+
+    def touch(self):
+        """Record activity for idle-eviction bookkeeping"""
+        self._last_touched = time.time()
+
+    @property
+    def last_touched(self) -> float:
+        return self._last_touched
+
+    @model_validator(mode="before")
+    @classmethod
+    def _split_interruptions(cls, data):
+        """Accept legacy payloads carrying one combined interruptions list"""
+        if isinstance(data, dict) and "interruptions" in data:
+            combined = data.pop("interruptions") or []
+            def _is_resolved(item):
+                if isinstance(item, dict):
+                    return item.get("resolved", False)
+                return item.resolved
+            data.setdefault(
+                "active_interruptions",
+                [i for i in combined if not _is_resolved(i)]
+            )
+            data.setdefault(
+                "resolved_interruptions",
+                [i for i in combined if _is_resolved(i)]
+            )
+        return data
+
+    @property
+    def interruptions(self) -> List[CookingInterruption]:
+        """All interruptions, active first (backwards-compatible view)"""
+        return self.active_interruptions + self.resolved_interruptions
+
+    @field_validator("conversation_history", mode="after")
+    @classmethod
+    def _bound_conversation_history(cls, value):
+        """Ensure history is a deque that drops old turns at O(1)"""
+        if not isinstance(value, deque) or value.maxlen != MAX_CONVERSATION_MESSAGES:
+            value = deque(value, maxlen=MAX_CONVERSATION_MESSAGES)
+        return value
+
+    def recent(self, k: int) -> List[Dict[str, str]]:
+        """Get the most recent k conversation messages"""
+        history = self.conversation_history
+        return list(islice(history, max(0, len(history) - k), len(history)))
+
     def add_interruption(self, interruption: CookingInterruption):
         """Add an interruption to the session"""
-        self.interruptions.append(interruption)
+        self.active_interruptions.append(interruption)
+
+    def resolve_interruption(self, interruption: CookingInterruption):
+        """Mark an interruption resolved, moving it off the active list"""
+        interruption.resolved = True
+        try:
+            self.active_interruptions.remove(interruption)
+        except ValueError:
+            pass
+        self.resolved_interruptions.append(interruption)
     
     def get_current_step(self, recipe: Recipe) -> Optional[RecipeStep]:
         """Get the current step from the recipe"""
@@ -80,6 +241,16 @@ class CookingSession(BaseModel):
         """Move to the next step"""
         self.current_step += 1
         self.step_status = StepStatus.PENDING
+
+    def complete_and_advance(self):
+        """Complete the current step and start the next as one update.
+
+        Collapses the completed -> advance -> in-progress write sequence so
+        concurrent readers (status polls, other turns awaiting the session
+        lock) never observe a transient intermediate state.
+        """
+        self.current_step += 1
+        self.step_status = StepStatus.IN_PROGRESS
     
     def pause_step(self, reason: str):
         """Pause the current step"""
@@ -91,12 +262,13 @@ class CookingSession(BaseModel):
             step_number=self.current_step
         )
         self.add_interruption(interruption)
-    
+
     def resume_step(self):
         """Resume the current step"""
         self.step_status = StepStatus.IN_PROGRESS
-        # Mark the last pause interruption as resolved
-        for interruption in reversed(self.interruptions):
-            if interruption.type == InterruptionType.PAUSE and not interruption.resolved:
-                interruption.resolved = True
+        # Resolve the most recent active pause; the active list only holds
+        # outstanding interruptions, so this scan is effectively O(1)
+        for interruption in reversed(self.active_interruptions):
+            if interruption.type == InterruptionType.PAUSE:
+                self.resolve_interruption(interruption)
                 break 
\ No newline at end of file
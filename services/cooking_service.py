@@ -1,13 +1,28 @@
+import asyncio
+import copy
+import inspect
+import threading
+import time
 import uuid
 import logging
-from typing import Dict, Optional, Any
+from typing import Awaitable, Callable, Dict, Final, Optional, Any, AsyncIterator
 from datetime import datetime
 
+from collections import OrderedDict
+
+import redis.asyncio as aioredis
+
+from config import Config
 from models import Recipe, CookingSession, CookingInterruption, StepStatus, InterruptionType
 from ai.conversation_engine import ConversationEngine
+from data.faq_seeds import load_faq_seeds
+from services.response_cache import SemanticResponseCache
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of exact-match cached AI results
+_EXACT_CACHE_SIZE: Final = 4096
+
 class CookingService:
     """
     Orchestrates cooking sessions, manages state, and coordinates between
@@ -16,11 +31,89 @@ class CookingService:
     
     def __init__(self):
         self.conversation_engine = ConversationEngine()
-        self.active_sessions: Dict[str, CookingSession] = {}
-    
+        # In-process cache in front of Redis; Redis is the shared source of
+        # truth so any worker can serve any session
+        # Copy-on-write session registry. Lookups vastly outnumber session
+        # creation/teardown, so readers take a single atomic reference load
+        # with no lock (demo prefetch threads read this too); writers copy
+        # the dict under a lock and swap the reference.
+        self._sessions_ref: Dict[str, CookingSession] = {}
+        self._registry_lock = threading.Lock()
+        # Two cache tiers in front of the LLM. The exact tier is an O(1)
+        # dict lookup for verbatim repeats ("next", "pause"), checked before
+        # any embedding math; the semantic tier catches paraphrases and is a
+        # no-op without the optional sentence-transformers dependency.
+        self._exact_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._semantic_cache = SemanticResponseCache()
+        if self._semantic_cache.available:
+            # One batched encoder pass over the canned FAQ corpus so the
+            # cache already hits for common phrasings on the first user
+            try:
+                self._semantic_cache.seed(load_faq_seeds())
+            except Exception as e:
+                logger.warning(f"Failed to seed semantic cache: {e}")
+        # One lock per session so concurrent turns on the same session are
+        # serialized while unrelated sessions proceed in parallel
+        self._session_locks: Dict[str, asyncio.Lock] = {}
+        self._redis = aioredis.from_url(
+            Config.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=1
+        )
+
+    @staticmethod
+    def _session_key(session_id: str) -> str:
+        return f"session:{session_id}"
+
+    def _session_lock(self, session_id: str) -> asyncio.Lock:
+        """Get (or create) the lock guarding mutations of one session"""
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = self._session_locks.setdefault(session_id, asyncio.Lock())
+        return lock
+
+    @property
+    def active_sessions(self) -> Dict[str, CookingSession]:
+        """Current registry snapshot (read-only; writers swap the reference)"""
+        return self._sessions_ref
+
+    def _register_session(self, session: CookingSession):
+        """Add a session to the registry via copy-and-swap, evicting idle
+        and least-recently-touched sessions to keep the registry bounded.
+
+        Eviction only drops the in-process copy; the session itself stays
+        in Redis and is reloaded transparently on its next turn.
+        """
+        with self._registry_lock:
+            sessions = dict(self._sessions_ref)
+
+            now = time.time()
+            for session_id, existing in list(sessions.items()):
+                if now - existing.last_touched > Config.SESSION_IDLE_TIMEOUT:
+                    del sessions[session_id]
+                    self._session_locks.pop(session_id, None)
+
+            while len(sessions) >= Config.MAX_ACTIVE_SESSIONS:
+                oldest = min(sessions, key=lambda sid: sessions[sid].last_touched)
+                del sessions[oldest]
+                self._session_locks.pop(oldest, None)
+
+            sessions[session.session_id] = session
+            self._sessions_ref = sessions
+
+    def _unregister_session(self, session_id: str) -> bool:
+        """Remove a session from the registry via copy-and-swap"""
+        with self._registry_lock:
+            if session_id not in self._sessions_ref:
+                return False
+            sessions = dict(self._sessions_ref)
+            del sessions[session_id]
+            self._sessions_ref = sessions
+        return True
+
     def start_cooking_session(self, recipe: Recipe, user_id: Optional[str] = None) -> CookingSession:
         """Start a new cooking session"""
-        
+
         session_id = str(uuid.uuid4())
         session = CookingSession(
             session_id=session_id,
@@ -29,51 +122,312 @@ class CookingService:
             current_step=0,
             step_status=StepStatus.PENDING
         )
-        
-        self.active_sessions[session_id] = session
+
+        self._register_session(session)
+        try:
+            # Persist in the background when a loop is running (API path);
+            # demo scripts run without one and stay in-process
+            asyncio.get_running_loop().create_task(self._save_session(session))
+        except RuntimeError:
+            pass
         logger.info(f"Started cooking session {session_id} for recipe {recipe.name}")
-        
+
         return session
-    
+
     def get_session(self, session_id: str) -> Optional[CookingSession]:
-        """Get an active cooking session"""
+        """Get an active cooking session from the in-process cache"""
         return self.active_sessions.get(session_id)
+
+    async def load_session(self, session_id: str) -> Optional[CookingSession]:
+        """Get a cooking session, falling back to Redis for sessions owned
+        by other workers or predating a restart"""
+
+        session = self.active_sessions.get(session_id)
+        if session is not None:
+            session.touch()
+            return session
+
+        try:
+            # One round-trip for the read plus the TTL refresh
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.get(self._session_key(session_id))
+                pipe.expire(self._session_key(session_id), Config.SESSION_TTL)
+                raw, _ = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis unavailable, using in-process sessions only: {e}")
+            return None
+
+        if raw is None:
+            return None
+
+        session = CookingSession.model_validate_json(raw)
+        self._register_session(session)
+        return session
+
+    async def _save_session(self, session: CookingSession):
+        """Persist a session to Redis (best effort)"""
+        try:
+            await self._redis.set(
+                self._session_key(session.session_id),
+                session.model_dump_json(),
+                ex=Config.SESSION_TTL
+            )
+        except Exception as e:
+            logger.warning(f"Failed to persist session {session.session_id} to Redis: {e}")
+
+    async def prewarm(self, session: CookingSession, recipe: Recipe):
+        """
+        Warm the first-turn path right after session creation.
+
+        Generates the introduction for the step the user lands on when they
+        say "start", so the first real input gets an instant reply. The call
+        also establishes the OpenAI connection pool before the first
+        user-facing request, hiding cold-start latency.
+        """
+        await self._prewarm_intro(session, recipe, session.current_step + 1)
+
+    async def _prewarm_intro(self, session: CookingSession, recipe: Recipe, step_index: int):
+        """
+        Speculatively generate the introduction for an upcoming step.
+
+        Runs in the background while the user works on the current step, so
+        that when they say "next" the introduction is already in
+        session.context and no API round-trip is needed.
+        """
+        if step_index >= recipe.step_count:
+            return
+        if not session.context.get("personalized_intros"):
+            # Default intros are precompiled on the recipe; nothing to warm
+            return
+        try:
+            preview = session.model_copy(deep=True)
+            preview.current_step = step_index
+            intro = await self.conversation_engine.generate_step_introduction(preview, recipe)
+            session.context["prewarmed_intro"] = intro
+            session.context["prewarmed_intro_step"] = step_index
+            logger.info(f"Prewarmed intro for step {step_index} of session {session.session_id}")
+        except Exception as e:
+            logger.warning(f"Prewarm failed for session {session.session_id}: {e}")
     
-    def process_user_input(
-        self, 
-        session_id: str, 
-        user_input: str, 
+    async def process_user_input(
+        self,
+        session_id: str,
+        user_input: str,
         recipe: Recipe
     ) -> Dict[str, Any]:
         """
         Process user input and return AI response with any actions to take.
-        
+
         This is the main entry point for handling user interactions during cooking.
         """
-        
-        session = self.get_session(session_id)
+
+        session = await self.load_session(session_id)
         if not session:
             return {
                 "error": "Session not found",
                 "response": "I'm sorry, I can't find your cooking session. Let's start over.",
                 "action": "restart"
             }
-        
+
+        # Serialize turns on the same session so concurrent inputs can't
+        # interleave half-applied state changes
+        async with self._session_lock(session_id):
+            return await self._process_turn(session, user_input, recipe)
+
+    async def _process_turn(
+        self,
+        session: CookingSession,
+        user_input: str,
+        recipe: Recipe
+    ) -> Dict[str, Any]:
+        """Run one user turn through the cache tiers and the engine
+        (caller holds the session lock)"""
+
+        # Exact tier: verbatim repeats of a past utterance in the same
+        # cooking state skip both the embedding model and the LLM
+        exact_key = (
+            user_input.strip().lower(),
+            recipe.id,
+            session.current_step,
+            session.step_status.value
+        )
+        cached = self._exact_cache.get(exact_key)
+        if cached is not None:
+            self._exact_cache.move_to_end(exact_key)
+            ai_result = copy.deepcopy(cached)
+            # Record the turn just as the engine does on its own
+            # cache-hit path, so the served exchange still appears in
+            # the transcript and later turns keep their antecedents
+            session.conversation_history.append({
+                "role": "user",
+                "content": user_input
+            })
+            session.conversation_history.append({
+                "role": "assistant",
+                "content": ai_result["response"]
+            })
+            result = await self._finalize_response(ai_result, session, recipe)
+            await self._save_session(session)
+            return result
+
+        # Semantic tier: a near-duplicate of a past utterance in the same
+        # (step, status) bucket reuses its stored result instead of
+        # round-tripping through the LLM. Encoding runs in a thread so the
+        # ~10ms transformer forward doesn't block the event loop.
+        bucket = (session.current_step, session.step_status.value)
+        embedding = None
+        if self._semantic_cache.available:
+            embedding = await asyncio.to_thread(self._semantic_cache.encode, user_input)
+            cached = self._semantic_cache.lookup(embedding, bucket)
+            if cached is not None:
+                ai_result = copy.deepcopy(cached)
+                # Same history bookkeeping as the exact tier above: the
+                # turn happened even though the LLM was skipped
+                session.conversation_history.append({
+                    "role": "user",
+                    "content": user_input
+                })
+                session.conversation_history.append({
+                    "role": "assistant",
+                    "content": ai_result["response"]
+                })
+                result = await self._finalize_response(ai_result, session, recipe)
+                await self._save_session(session)
+                return result
+
         # Let the AI generate a response
+        # (the demo scripts monkey patch generate_response with plain
+        # functions, so tolerate both sync and async results here)
         ai_result = self.conversation_engine.generate_response(
             user_input=user_input,
             session=session,
             recipe=recipe
         )
-        
+        if inspect.isawaitable(ai_result):
+            ai_result = await ai_result
+
+        # Don't cache the engine's error fallback — a transient failure
+        # would otherwise pin the apology for this utterance/state forever
+        if not ai_result.get("error"):
+            self._exact_cache[exact_key] = copy.deepcopy(ai_result)
+            if len(self._exact_cache) > _EXACT_CACHE_SIZE:
+                self._exact_cache.popitem(last=False)
+            self._semantic_cache.store(embedding, bucket, copy.deepcopy(ai_result))
+
+        result = await self._finalize_response(ai_result, session, recipe)
+        await self._save_session(session)
+        return result
+
+    async def prefetch_user_input(
+        self,
+        session_id: str,
+        user_input: str,
+        recipe: Recipe
+    ):
+        """
+        Speculatively compute and cache the AI result for an utterance the
+        user is likely to say next.
+
+        Runs the conversation engine against a deep copy of the session so
+        no state is mutated and no action is executed; the result lands in
+        the exact-match cache. If the user then says the predicted phrase,
+        the real turn is served without an LLM round-trip. Overlaps LLM
+        latency with TTS playback / remaining user speech.
+        """
+        session = await self.load_session(session_id)
+        if not session:
+            return
+
+        exact_key = (
+            user_input.strip().lower(),
+            recipe.id,
+            session.current_step,
+            session.step_status.value
+        )
+        if exact_key in self._exact_cache:
+            return
+
+        try:
+            preview = session.model_copy(deep=True)
+            ai_result = self.conversation_engine.generate_response(
+                user_input=user_input,
+                session=preview,
+                recipe=recipe
+            )
+            if inspect.isawaitable(ai_result):
+                ai_result = await ai_result
+        except Exception as e:
+            logger.warning(f"Prefetch failed for session {session_id}: {e}")
+            return
+
+        # Only keep the result if the session is still in the state it was
+        # generated for; otherwise it would answer a stale context. Error
+        # fallbacks are never worth pinning either.
+        if (not ai_result.get("error")
+                and (session.current_step, session.step_status.value) == exact_key[2:]):
+            self._exact_cache[exact_key] = copy.deepcopy(ai_result)
+            if len(self._exact_cache) > _EXACT_CACHE_SIZE:
+                self._exact_cache.popitem(last=False)
+
+    async def stream_user_input(
+        self,
+        session_id: str,
+        user_input: str,
+        recipe: Recipe
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the AI response for user input as it is generated.
+
+        Yields {"type": "delta", "text": ...} frames while tokens arrive,
+        {"type": "action", "action": ...} as soon as the action is known,
+        then a final {"type": "done", "result": ...} carrying the same
+        payload process_user_input returns.
+        """
+
+        session = await self.load_session(session_id)
+        if not session:
+            yield {
+                "type": "done",
+                "result": {
+                    "error": "Session not found",
+                    "response": "I'm sorry, I can't find your cooking session. Let's start over.",
+                    "action": "restart"
+                }
+            }
+            return
+
+        async with self._session_lock(session_id):
+            ai_result = None
+            async for event in self.conversation_engine.stream_response(
+                user_input=user_input,
+                session=session,
+                recipe=recipe
+            ):
+                if event["type"] == "done":
+                    ai_result = event["result"]
+                else:
+                    yield event
+
+            result = await self._finalize_response(ai_result, session, recipe)
+            await self._save_session(session)
+        yield {"type": "done", "result": result}
+
+    async def _finalize_response(
+        self,
+        ai_result: Dict[str, Any],
+        session: CookingSession,
+        recipe: Recipe
+    ) -> Dict[str, Any]:
+        """Execute the AI's requested action and build the response payload"""
+
         # Execute any actions the AI requested
-        action_result = self._execute_action(
+        action_result = await self._execute_action(
             action=ai_result["action"],
             session=session,
             recipe=recipe,
             context_updates=ai_result.get("context_updates", {})
         )
-        
+
         # Combine AI response with action results
         result = {
             "response": ai_result["response"],
@@ -81,83 +435,117 @@ class CookingService:
             "session_update": action_result,
             "current_step": session.current_step,
             "step_status": session.step_status.value,
-            "total_steps": len(recipe.steps)
+            "total_steps": recipe.step_count
         }
-        
-        # Add step information if we're in a step
-        current_step = session.get_current_step(recipe)
-        if current_step:
-            result["current_step_info"] = {
-                "instruction": current_step.instruction,
-                "estimated_time": current_step.estimated_time,
-                "tips": current_step.tips
-            }
-        
+
+        # Add step information if we're in a step (precomputed payloads
+        # shared by reference rather than rebuilt per turn)
+        if 0 <= session.current_step < recipe.step_count:
+            result["current_step_info"] = recipe.step_info[session.current_step]
+
         return result
-    
-    def _execute_action(
-        self, 
-        action: str, 
-        session: CookingSession, 
+
+
+    async def _do_pause(self, session: CookingSession, recipe: Recipe, result: Dict[str, Any]):
+        session.pause_step("User requested pause")
+        result["message"] = "Cooking paused"
+
+    async def _do_resume(self, session: CookingSession, recipe: Recipe, result: Dict[str, Any]):
+        session.resume_step()
+        result["message"] = "Cooking resumed"
+
+    async def _do_next_step(self, session: CookingSession, recipe: Recipe, result: Dict[str, Any]):
+        if session.current_step < recipe.last_step_idx:
+            session.complete_and_advance()
+            result["message"] = f"Advanced to step {session.current_step + 1}"
+
+            if not session.context.get("personalized_intros"):
+                # Step intros are deterministic from the recipe text, so the
+                # default path reads the string precompiled at recipe load —
+                # no LLM call for the most common user intent
+                result["step_introduction"] = recipe.step_intros[session.current_step]
+                return
+
+            # Personalized intros: use the prewarmed one if it matches the
+            # new step, otherwise generate now
+            if session.context.get("prewarmed_intro_step") == session.current_step:
+                intro = session.context.pop("prewarmed_intro")
+                session.context.pop("prewarmed_intro_step", None)
+            else:
+                # Generate introduction for new step
+                intro = await self.conversation_engine.generate_step_introduction(session, recipe)
+            result["step_introduction"] = intro
+
+            # Speculatively warm the intro for the step after this one
+            # so a follow-up "next" is served from the context cache
+            try:
+                asyncio.get_running_loop().create_task(
+                    self._prewarm_intro(session, recipe, session.current_step + 1)
+                )
+            except RuntimeError:
+                pass
+        else:
+            session.step_status = StepStatus.COMPLETED
+            result["message"] = "Recipe completed!"
+
+    async def _do_repeat_step(self, session: CookingSession, recipe: Recipe, result: Dict[str, Any]):
+        # Just keep current step, maybe mark as in progress
+        session.step_status = StepStatus.IN_PROGRESS
+        result["message"] = "Repeating current step"
+
+    async def _do_go_back(self, session: CookingSession, recipe: Recipe, result: Dict[str, Any]):
+        if session.current_step > 0:
+            session.current_step -= 1
+            session.step_status = StepStatus.IN_PROGRESS
+            result["message"] = f"Went back to step {session.current_step + 1}"
+        else:
+            result["message"] = "Already at the first step"
+
+    async def _do_complete_recipe(self, session: CookingSession, recipe: Recipe, result: Dict[str, Any]):
+        session.step_status = StepStatus.COMPLETED
+        result["message"] = "Recipe completed! Great job!"
+
+    # Single dict lookup dispatches an action to its handler instead of a
+    # linear if/elif walk over the action names ("none" has no handler).
+    # Final so type checkers (and any future AOT compiler) can treat the
+    # table and its call sites as fixed.
+    _ACTIONS: Final[Dict[str, Callable[..., Awaitable[None]]]] = {
+        "pause": _do_pause,
+        "resume": _do_resume,
+        "next_step": _do_next_step,
+        "repeat_step": _do_repeat_step,
+        "go_back": _do_go_back,
+        "complete_recipe": _do_complete_recipe,
+    }
+
+    async def _execute_action(
+        self,
+        action: str,
+        session: CookingSession,
         recipe: Recipe,
         context_updates: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Execute an action requested by the AI"""
-        
+
         result = {"action_executed": action}
-        
+
         # Update session context
         if context_updates:
             session.context.update(context_updates)
-        
-        if action == "pause":
-            session.pause_step("User requested pause")
-            result["message"] = "Cooking paused"
-            
-        elif action == "resume":
-            session.resume_step()
-            result["message"] = "Cooking resumed"
-            
-        elif action == "next_step":
-            if session.current_step < len(recipe.steps) - 1:
-                session.step_status = StepStatus.COMPLETED
-                session.advance_step()
-                session.step_status = StepStatus.IN_PROGRESS
-                result["message"] = f"Advanced to step {session.current_step + 1}"
-                
-                # Generate introduction for new step
-                intro = self.conversation_engine.generate_step_introduction(session, recipe)
-                result["step_introduction"] = intro
-            else:
-                session.step_status = StepStatus.COMPLETED
-                result["message"] = "Recipe completed!"
-                
-        elif action == "repeat_step":
-            # Just keep current step, maybe mark as in progress
-            session.step_status = StepStatus.IN_PROGRESS
-            result["message"] = "Repeating current step"
-            
-        elif action == "go_back":
-            if session.current_step > 0:
-                session.current_step -= 1
-                session.step_status = StepStatus.IN_PROGRESS
-                result["message"] = f"Went back to step {session.current_step + 1}"
-            else:
-                result["message"] = "Already at the first step"
-                
-        elif action == "complete_recipe":
-            session.step_status = StepStatus.COMPLETED
-            result["message"] = "Recipe completed! Great job!"
-            
+
+        handler = self._ACTIONS.get(action)
+        if handler is not None:
+            await handler(self, session, recipe, result)
+
         # Log the action
         logger.info(f"Executed action '{action}' for session {session.session_id}")
-        
+
         return result
     
-    def get_cooking_status(self, session_id: str, recipe: Recipe) -> Dict[str, Any]:
+    async def get_cooking_status(self, session_id: str, recipe: Recipe) -> Dict[str, Any]:
         """Get current status of a cooking session"""
-        
-        session = self.get_session(session_id)
+
+        session = await self.load_session(session_id)
         if not session:
             return {"error": "Session not found"}
         
@@ -167,34 +555,29 @@ class CookingService:
             "session_id": session_id,
             "recipe_name": recipe.name,
             "current_step": session.current_step + 1,
-            "total_steps": len(recipe.steps),
+            "total_steps": recipe.step_count,
             "step_status": session.step_status.value,
             "current_instruction": current_step.instruction if current_step else None,
             "estimated_time": current_step.estimated_time if current_step else None,
             "active_interruptions": [
-                {
-                    "type": i.type.value,
-                    "reason": i.reason,
-                    "timestamp": i.timestamp.isoformat()
-                }
-                for i in session.interruptions if not i.resolved
+                i.serialized for i in session.active_interruptions
             ],
             "session_context": session.context
         }
     
-    def handle_interruption(
-        self, 
-        session_id: str, 
-        interruption_type: InterruptionType, 
+    async def handle_interruption(
+        self,
+        session_id: str,
+        interruption_type: InterruptionType,
         reason: str,
         user_message: Optional[str] = None
     ) -> Dict[str, Any]:
         """Handle a specific interruption (like disasters, timing issues, etc.)"""
-        
-        session = self.get_session(session_id)
+
+        session = await self.load_session(session_id)
         if not session:
             return {"error": "Session not found"}
-        
+
         # Create interruption record
         interruption = CookingInterruption(
             type=interruption_type,
@@ -203,15 +586,17 @@ class CookingService:
             step_number=session.current_step,
             user_message=user_message
         )
-        
-        session.add_interruption(interruption)
-        
-        # Pause the session if it's a disaster or timing issue
-        if interruption_type in [InterruptionType.DISASTER, InterruptionType.TIMING_ISSUE]:
-            session.step_status = StepStatus.PAUSED
-        
+
+        async with self._session_lock(session_id):
+            session.add_interruption(interruption)
+
+            # Pause the session if it's a disaster or timing issue
+            if interruption_type in [InterruptionType.DISASTER, InterruptionType.TIMING_ISSUE]:
+                session.step_status = StepStatus.PAUSED
+
+            await self._save_session(session)
         logger.info(f"Handled interruption: {interruption_type.value} - {reason}")
-        
+
         return {
             "interruption_handled": True,
             "type": interruption_type.value,
@@ -219,11 +604,16 @@ class CookingService:
             "session_paused": session.step_status == StepStatus.PAUSED
         }
     
-    def end_session(self, session_id: str) -> bool:
+    async def end_session(self, session_id: str) -> bool:
         """End a cooking session"""
-        
-        if session_id in self.active_sessions:
-            del self.active_sessions[session_id]
+
+        found = self._unregister_session(session_id)
+        self._session_locks.pop(session_id, None)
+        try:
+            found = bool(await self._redis.delete(self._session_key(session_id))) or found
+        except Exception as e:
+            logger.warning(f"Failed to delete session {session_id} from Redis: {e}")
+
+        if found:
             logger.info(f"Ended cooking session {session_id}")
-            return True
-        return False 
\ No newline at end of file
+        return found 
\ No newline at end of file
@@ -0,0 +1,164 @@
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+import numpy as np
+
+# Embeddings are optional: without sentence-transformers installed the cache
+# simply never hits and every turn falls through to the conversation engine
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+# Small, fast sentence encoder (~80MB, ~10ms per utterance on CPU)
+_MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Minimum cosine similarity for a cache hit. Cooking commands are short and
+# formulaic, so 0.83 separates paraphrases from genuinely new requests.
+_DEFAULT_THRESHOLD = 0.83
+
+_DEFAULT_MAX_ENTRIES = 2048
+
+
+class SemanticResponseCache:
+    """
+    Similarity cache over previously generated AI results.
+
+    User utterances are embedded with a sentence transformer and compared
+    against past turns by cosine similarity. Cooking dialog is highly
+    repetitive ("next", "I'm ready", "what's next"), so near-duplicate
+    phrasings can reuse a stored result and skip the LLM call entirely.
+
+    Entries are bucketed by (current_step, step_status) so step-specific
+    responses don't leak across steps; a bucket of None matches any state
+    (used for seeded step-agnostic FAQ answers). Capacity is bounded with
+    least-recently-hit eviction.
+    """
+
+    def __init__(
+        self,
+        threshold: float = _DEFAULT_THRESHOLD,
+        max_entries: int = _DEFAULT_MAX_ENTRIES
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._encoder = None
+        self._disabled = False
+        # Row-parallel storage: an (N, d) matrix of L2-normalized embeddings
+        # plus per-row bucket, result, and last-hit tick lists
+        self._matrix = None
+        self._buckets: List[Optional[Tuple[int, str]]] = []
+        self._results: List[Dict[str, Any]] = []
+        self._last_hit: List[int] = []
+        self._tick = 0
+
+    @property
+    def available(self) -> bool:
+        """Whether the embedding dependencies are installed and working"""
+        return SentenceTransformer is not None and not self._disabled
+
+    def _get_encoder(self):
+        if self._encoder is None:
+            self._encoder = SentenceTransformer(_MODEL_NAME)
+        return self._encoder
+
+    def encode(self, text: str):
+        """Embed a single utterance (None when embeddings are unavailable)"""
+        if not self.available:
+            return None
+        try:
+            return self._get_encoder().encode(
+                [text],
+                normalize_embeddings=True,
+                convert_to_numpy=True
+            )[0]
+        except Exception as e:
+            # E.g. model weights can't be downloaded; disable the cache
+            # rather than failing every turn
+            logger.warning(f"Semantic cache disabled, encoder failed: {e}")
+            self._disabled = True
+            return None
+
+    def encode_batch(self, texts: List[str]):
+        """Embed many utterances in one batched forward pass"""
+        if not self.available or not texts:
+            return None
+        try:
+            return self._get_encoder().encode(
+                texts,
+                batch_size=64,
+                normalize_embeddings=True,
+                convert_to_numpy=True
+            )
+        except Exception as e:
+            logger.warning(f"Semantic cache disabled, encoder failed: {e}")
+            self._disabled = True
+            return None
+
+    def seed(self, entries: List[Dict[str, Any]]):
+        """Preload canonical utterances with one batched encoder pass.
+
+        Seeds carry a wildcard bucket so they can answer from any cooking
+        state, giving the cache a high hit rate before the first real user.
+        """
+        embeddings = self.encode_batch([entry["prompt"] for entry in entries])
+        if embeddings is None:
+            return
+        for embedding, entry in zip(embeddings, entries):
+            self.store(embedding, None, {
+                "response": entry["response"],
+                "action": entry["action"]
+            })
+        logger.info(f"Seeded semantic cache with {len(entries)} utterances")
+
+    def lookup(self, embedding, bucket: Tuple[int, str]) -> Optional[Dict[str, Any]]:
+        """Return the stored result most similar to the embedding, if any
+        entry in a matching bucket clears the threshold"""
+        if embedding is None or self._matrix is None:
+            return None
+
+        # One matrix-vector product scores every cached entry; rows from
+        # other buckets are masked out before taking the best match
+        scores = self._matrix @ embedding
+        mask = np.fromiter(
+            (b is None or b == bucket for b in self._buckets),
+            dtype=bool,
+            count=len(self._buckets)
+        )
+        scores = np.where(mask, scores, -1.0)
+        idx = int(scores.argmax())
+        if scores[idx] < self.threshold:
+            return None
+
+        self._tick += 1
+        self._last_hit[idx] = self._tick
+        return self._results[idx]
+
+    def store(
+        self,
+        embedding,
+        bucket: Optional[Tuple[int, str]],
+        result: Dict[str, Any]
+    ):
+        """Add an entry, evicting the least-recently-hit row when full"""
+        if embedding is None:
+            return
+
+        if self._matrix is not None and len(self._results) >= self.max_entries:
+            evict = min(range(len(self._last_hit)), key=self._last_hit.__getitem__)
+            self._matrix = np.delete(self._matrix, evict, axis=0)
+            del self._buckets[evict]
+            del self._results[evict]
+            del self._last_hit[evict]
+
+        row = embedding.reshape(1, -1)
+        if self._matrix is None:
+            self._matrix = row
+        else:
+            self._matrix = np.vstack([self._matrix, row])
+        self._tick += 1
+        self._buckets.append(bucket)
+        self._results.append(result)
+        self._last_hit.append(self._tick)
@@ -5,58 +5,68 @@ This demonstrates the conversation flow without requiring OpenAI API calls
 """
 
 import sys
+import asyncio
 import os
+import re
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from models import Recipe, CookingSession, StepStatus
 from services.cooking_service import CookingService
 from data.sample_recipes import get_recipe
 
+# One compiled regex scan classifies the utterance in a single C-level pass;
+# the matched group name picks the canned response from the table below
+_INTENT_RE = re.compile(
+    r"\b(?:(?P<start>start|begin)"
+    r"|(?P<next>next|done)"
+    r"|(?P<pause>pause|wait)"
+    r"|(?P<resume>resume|continue|ready)"
+    r"|(?P<repeat>repeat|again)"
+    r"|(?P<disaster>dropped|fell|disaster)"
+    r"|(?P<help>help|stuck))\b",
+    re.IGNORECASE
+)
+
+_MOCK_RESPONSES = {
+    "start": {
+        "response": "Perfect! Let's start cooking. First, we'll season the ground beef. Get your mixing bowl ready!",
+        "action": "next_step"
+    },
+    "next": {
+        "response": "Great job! Moving to the next step.",
+        "action": "next_step"
+    },
+    "pause": {
+        "response": "No problem! I'll pause here. Take your time, and let me know when you're ready to continue.",
+        "action": "pause"
+    },
+    "resume": {
+        "response": "Welcome back! Let's continue where we left off.",
+        "action": "resume"
+    },
+    "repeat": {
+        "response": "Sure! Let me repeat the current step for you.",
+        "action": "repeat_step"
+    },
+    "disaster": {
+        "response": "Oh no! Kitchen accidents happen to everyone. No worries at all! Do you need to start this step over, or can you continue?",
+        "action": "pause"
+    },
+    "help": {
+        "response": "I'm here to help! What's going on? Are you having trouble with the current step?",
+        "action": "none"
+    },
+    "default": {
+        "response": "I understand! Let me know if you need help, want to continue, or need to pause.",
+        "action": "none"
+    }
+}
+
 def mock_ai_response(user_input: str, session: CookingSession, recipe: Recipe):
     """Mock AI response for demo purposes"""
-    user_input = user_input.lower()
-    
-    # Simple pattern matching for demo
-    if "start" in user_input or "begin" in user_input:
-        return {
-            "response": "Perfect! Let's start cooking. First, we'll season the ground beef. Get your mixing bowl ready!",
-            "action": "next_step"
-        }
-    elif "next" in user_input or "done" in user_input:
-        return {
-            "response": "Great job! Moving to the next step.",
-            "action": "next_step"
-        }
-    elif "pause" in user_input or "wait" in user_input:
-        return {
-            "response": "No problem! I'll pause here. Take your time, and let me know when you're ready to continue.",
-            "action": "pause"
-        }
-    elif "resume" in user_input or "continue" in user_input or "ready" in user_input:
-        return {
-            "response": "Welcome back! Let's continue where we left off.",
-            "action": "resume"
-        }
-    elif "repeat" in user_input or "again" in user_input:
-        return {
-            "response": "Sure! Let me repeat the current step for you.",
-            "action": "repeat_step"
-        }
-    elif "dropped" in user_input or "fell" in user_input or "disaster" in user_input:
-        return {
-            "response": "Oh no! Kitchen accidents happen to everyone. No worries at all! Do you need to start this step over, or can you continue?",
-            "action": "pause"
-        }
-    elif "help" in user_input or "stuck" in user_input:
-        return {
-            "response": "I'm here to help! What's going on? Are you having trouble with the current step?",
-            "action": "none"
-        }
-    else:
-        return {
-            "response": "I understand! Let me know if you need help, want to continue, or need to pause.",
-            "action": "none"
-        }
+    match = _INTENT_RE.search(user_input)
+    intent = match.lastgroup if match else "default"
+    return dict(_MOCK_RESPONSES[intent])
 
 def demo_cooking_session():
     """Demonstrate a cooking session with the burger recipe"""
@@ -119,11 +129,11 @@ def demo_cooking_session():
         
         # Process input
         try:
-            result = cooking_service.process_user_input(
+            result = asyncio.run(cooking_service.process_user_input(
                 session_id=session.session_id,
                 user_input=user_input,
                 recipe=recipe
-            )
+            ))
             
             print(f"🤖 AI: {result['response']}")
             
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Shared construction helpers for the voice demo assistants.
+
+The demo scripts each bring up the same expensive, stateful pieces: the
+pyttsx3 driver (COM/NSSpeechSynthesizer bring-up), the recognizer, and
+the microphone (device enumeration). These are process-wide singletons
+here, so instantiating more than one assistant in a process — e.g. when
+tests import several demos — reuses them instead of starting a second
+audio stack. A single pyttsx3 engine per process also rules out the
+"run loop already started" driver crashes outright.
+
+Imports are deferred into the factories so merely importing this module
+does not pull in the audio stack.
+"""
+
+import functools
+
+
+@functools.lru_cache(maxsize=1)
+def get_tts_engine():
+    """The process-wide pyttsx3 engine, initialized exactly once."""
+    import pyttsx3
+    return pyttsx3.init()
+
+
+@functools.lru_cache(maxsize=1)
+def get_recognizer():
+    """The process-wide speech recognizer."""
+    import speech_recognition as sr
+    return sr.Recognizer()
+
+
+@functools.lru_cache(maxsize=1)
+def get_microphone():
+    """The process-wide microphone.
+
+    Captured at 16 kHz LINEAR16 — all the recognizers here (Google, local
+    Whisper) consume 16 kHz mono, so recording at the device's native
+    44.1/48 kHz only triples the bytes copied, uploaded, and resampled.
+    For best accuracy also disable AGC/noise suppression at the OS mixer;
+    both interact badly with the recognizers' own front ends.
+    """
+    import speech_recognition as sr
+    return sr.Microphone(sample_rate=16000, chunk_size=1024)
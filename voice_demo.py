@@ -5,10 +5,26 @@ This version uses your microphone for input and the native 'say' command for spe
 """
 
 import sys
+import asyncio
 import os
 import queue
+import time
 import speech_recognition as sr
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Local speech recognition is optional; without faster-whisper installed
+# the demo keeps using the Google Web Speech API
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+# The most likely next utterances during a step; prefetched while the
+# assistant is still speaking so saying one of them gets a cached reply
+LIKELY_NEXT_UTTERANCES = ("next", "done", "I'm ready")
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
@@ -19,10 +35,27 @@ from data.sample_recipes import get_recipe
 class VoiceCookingAssistant:
     def __init__(self):
         self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+        # 16 kHz is all the recognizers consume; capturing at the device's
+        # native 44.1/48 kHz would just triple the bytes copied and uploaded
+        self.microphone = sr.Microphone(sample_rate=16000, chunk_size=1024)
         self.cooking_service = CookingService()
         self.voice_queue = queue.Queue()
         self.tts_process = None
+        # Killed 'say' processes awaiting reaping; polled on the next speak
+        # call instead of blocking the loop in wait()
+        self._old_tts: list = []
+        # Worker pool for speculative LLM calls that overlap TTS playback
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=2)
+
+        # Local int8 Whisper when available: no network round-trip per
+        # utterance, and its VAD filter skips silent audio entirely
+        self._whisper_model = None
+        if WhisperModel is not None:
+            try:
+                self._whisper_model = WhisperModel("base.en", compute_type="int8")
+                print("🧠 Using local Whisper for speech recognition")
+            except Exception as e:
+                print(f"⚠️  Local Whisper unavailable ({e}), using Google STT")
 
         # Set a static, higher energy threshold to avoid picking up bot speech
         self.recognizer.energy_threshold = 4000
@@ -37,22 +70,100 @@ class VoiceCookingAssistant:
         with self.microphone as source:
             self.recognizer.adjust_for_ambient_noise(source, duration=1)
         print("✅ Microphone calibrated!")
+        self._warm_stt()
+
+    def _warm_stt(self):
+        """Prime the speech backend while setup noise is still acceptable.
+
+        For Google STT this sends a tiny silence clip so DNS resolution and
+        the TLS handshake happen now instead of on the first real
+        utterance; for local Whisper it runs one decode to page the model
+        weights in. Runs in the background pool so startup isn't delayed.
+        """
+        def _prime():
+            silence = sr.AudioData(b"\x00\x00" * 3200, 16000, 2)  # 200ms
+            try:
+                self._transcribe(silence)
+            except Exception:
+                pass  # Expected: there's nothing to recognize in silence
+
+        self._prefetch_pool.submit(_prime)
 
     def speak(self, text):
         """Convert text to speech using the non-blocking 'say' command."""
-        # Stop any currently running speech
+        # Stop any currently running speech without waiting for teardown;
+        # SIGKILL is immediate and the old process is reaped later
         if self.tts_process and self.tts_process.poll() is None:
-            self.tts_process.terminate()
-            self.tts_process.wait()
+            self.tts_process.kill()
+            self._old_tts.append(self.tts_process)
+        self._old_tts = [p for p in self._old_tts if p.poll() is None]
+
+        # Drop transcripts captured while the previous speech was playing
+        # (usually the bot hearing itself) so they aren't processed as input
+        self._clear_voice_queue()
 
         print(f"🤖 AI: {text}")
         # Use non-blocking Popen for the 'say' command
         self.tts_process = subprocess.Popen(["say", text])
 
+    def _clear_voice_queue(self):
+        """Discard any queued transcripts without blocking."""
+        while True:
+            try:
+                self.voice_queue.get_nowait()
+            except queue.Empty:
+                break
+
+    def _drain_latest(self, timeout=60, settle=0.25):
+        """Wait for the next transcript, then keep only the newest of any
+        hypotheses that piled up behind it (stale ones answered a state
+        that has already moved on)."""
+        latest = self.voice_queue.get(timeout=timeout)
+        deadline = time.monotonic() + settle
+        while time.monotonic() < deadline:
+            try:
+                latest = self.voice_queue.get_nowait()
+            except queue.Empty:
+                break
+        return latest
+
+    def _prefetch_likely_inputs(self, session, recipe):
+        """Warm the service's response cache for the phrases the user is
+        most likely to say next, while they're still listening to the TTS."""
+        for utterance in LIKELY_NEXT_UTTERANCES:
+            self._prefetch_pool.submit(
+                asyncio.run,
+                self.cooking_service.prefetch_user_input(
+                    session_id=session.session_id,
+                    user_input=utterance,
+                    recipe=recipe
+                )
+            )
+
+    def _transcribe(self, audio):
+        """Transcribe one utterance, locally when Whisper is loaded.
+
+        The int8 Whisper path runs in this background listener thread (the
+        ctranslate2 kernels release the GIL) and never touches the network;
+        vad_filter drops silent chunks before any decoding happens.
+        """
+        if self._whisper_model is not None:
+            samples = np.frombuffer(
+                audio.get_raw_data(convert_rate=16000, convert_width=2),
+                dtype=np.int16
+            ).astype(np.float32) / 32768.0
+            segments, _ = self._whisper_model.transcribe(
+                samples, language="en", beam_size=1, vad_filter=True
+            )
+            return " ".join(segment.text.strip() for segment in segments).strip()
+        return self.recognizer.recognize_google(audio)
+
     def _audio_callback(self, recognizer, audio):
         """Callback function for background listening."""
         try:
-            text = recognizer.recognize_google(audio)
+            text = self._transcribe(audio)
+            if not text:
+                return # Nothing but silence/noise in the chunk
             print(f"👤 You said: {text}")
             self.voice_queue.put(text)
         except sr.UnknownValueError:
@@ -76,20 +187,23 @@ class VoiceCookingAssistant:
         try:
             while True:
                 try:
-                    user_input = self.voice_queue.get(timeout=60) # Wait for user input
+                    user_input = self._drain_latest(timeout=60) # Wait for user input
 
                     if user_input.lower() in ['quit', 'exit', 'stop cooking']:
                         self.speak("Thanks for cooking with me! Goodbye.")
                         break
 
-                    result = self.cooking_service.process_user_input(
+                    result = asyncio.run(self.cooking_service.process_user_input(
                         session_id=session.session_id,
                         user_input=user_input,
                         recipe=recipe
-                    )
+                    ))
 
                     self.speak(result['response'])
 
+                    # Speculate on the next turn while the TTS is playing
+                    self._prefetch_likely_inputs(session, recipe)
+
                     if result.get('session_update', {}).get('step_introduction'):
                         self.speak(result['session_update']['step_introduction'])
 
@@ -109,6 +223,7 @@ class VoiceCookingAssistant:
         finally:
             print("🛑 Stopping background listener...")
             stop_listening(wait_for_stop=False)
+            self._prefetch_pool.shutdown(wait=False)
             if self.tts_process:
                 self.tts_process.terminate()
 
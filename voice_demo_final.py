@@ -4,161 +4,650 @@ Final voice demo - fixes audio glitches and gives more microphone time
 """
 
 import sys
+import asyncio
+import hashlib
+import json
 import os
+import platform
 import threading
 import time
-import speech_recognition as sr
-import pyttsx3
+import queue
+import re
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
 import subprocess
 
+# The audio stack (speech_recognition/pyttsx3/numpy and the optional
+# recognizers) is imported lazily in __init__: it drags in PortAudio and
+# platform speech frameworks, which importing this module for tests or
+# --help should not pay for. The names are module globals so the methods
+# below see them once an assistant exists.
+sr = None
+pyttsx3 = None
+np = None
+gcs_speech = None
+WhisperModel = None
+simpleaudio = None
+
+
+def _import_audio_stack():
+    """Load the heavy audio/speech modules on first use."""
+    global sr, pyttsx3, np, gcs_speech, WhisperModel, simpleaudio
+    if sr is not None:
+        return
+
+    import numpy
+    import speech_recognition
+    import pyttsx3 as _pyttsx3
+    np = numpy
+    sr = speech_recognition
+    pyttsx3 = _pyttsx3
+
+    # Streaming Cloud Speech is optional; without the client library
+    # installed the demo keeps using the blocking Google Web Speech API
+    try:
+        from google.cloud import speech as _gcs
+        gcs_speech = _gcs
+    except ImportError:
+        pass
+
+    # Local speech recognition is optional; without faster-whisper
+    # installed the demo keeps using a network recognizer
+    try:
+        from faster_whisper import WhisperModel as _WhisperModel
+        WhisperModel = _WhisperModel
+    except ImportError:
+        pass
+
+    # Pre-rendered WAV playback is optional; without simpleaudio installed
+    # every utterance goes through live synthesis as before
+    try:
+        import simpleaudio as _simpleaudio
+        simpleaudio = _simpleaudio
+    except ImportError:
+        pass
+
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Ambient-noise calibration result persisted across runs; pass
+# --recalibrate to force a fresh measurement
+_MIC_CAL_PATH = os.path.expanduser("~/.foodingo/mic_cal.json")
+_MIC_CAL_MAX_AGE = 24 * 3600  # seconds
+
+# Sentence boundaries for chunked TTS playback
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Resolved TTS voice id persisted so later launches skip the slow
+# getProperty('voices') enumeration entirely
+_VOICE_CACHE_PATH = os.path.expanduser("~/.foodingo/voice.cache")
+
+# Pre-rendered audio for the demo's fixed phrases, keyed by voice + text
+_TTS_CACHE_DIR = os.path.expanduser("~/.foodingo/tts_cache")
+
+# Voice preference ranking; lower rank wins
+_PREFERRED_VOICES = {
+    name: rank for rank, name in enumerate(
+        ['samantha', 'alex', 'victoria', 'allison', 'ava', 'karen', 'moira']
+    )
+}
+
+# Canned demo responses shared between keywords that mean the same thing
+_START_RESPONSE = {
+    "response": "Perfect! Let's start cooking. First, season the ground beef in a large bowl.",
+    "action": "next_step"
+}
+_NEXT_RESPONSE = {"response": "Great! Moving to the next step.", "action": "next_step"}
+_PAUSE_RESPONSE = {"response": "Paused. Say continue when ready.", "action": "pause"}
+_RESUME_RESPONSE = {"response": "Continuing where we left off.", "action": "resume"}
+_REPEAT_RESPONSE = {"response": "Repeating current step.", "action": "repeat_step"}
+_DISASTER_RESPONSE = {
+    "response": "No worries! Kitchen accidents happen. Need to restart this step?",
+    "action": "pause"
+}
+_HELP_RESPONSE = {"response": "I'm here to help! What's the problem?", "action": "none"}
+_STOP_RESPONSE = {"response": "Thanks for cooking with me!", "action": "complete_recipe"}
+_DEFAULT_RESPONSE = {
+    "response": "Got it. Say help or next whenever you're ready.",
+    "action": "none"
+}
+
+# keyword -> (priority, response); lower priority wins when an utterance
+# contains several keywords, mirroring the old elif ordering
+_COMMAND_TABLE = {
+    "start": (0, _START_RESPONSE), "begin": (0, _START_RESPONSE),
+    "next": (1, _NEXT_RESPONSE), "done": (1, _NEXT_RESPONSE),
+    "ready": (1, _NEXT_RESPONSE),
+    "pause": (2, _PAUSE_RESPONSE), "wait": (2, _PAUSE_RESPONSE),
+    "resume": (3, _RESUME_RESPONSE), "continue": (3, _RESUME_RESPONSE),
+    "repeat": (4, _REPEAT_RESPONSE), "again": (4, _REPEAT_RESPONSE),
+    "dropped": (5, _DISASTER_RESPONSE), "fell": (5, _DISASTER_RESPONSE),
+    "disaster": (5, _DISASTER_RESPONSE),
+    "help": (6, _HELP_RESPONSE), "stuck": (6, _HELP_RESPONSE),
+    "stop": (7, _STOP_RESPONSE), "quit": (7, _STOP_RESPONSE),
+    "exit": (7, _STOP_RESPONSE),
+}
+
+# The only words allowed to barge in while the assistant is speaking;
+# matched on word boundaries so self-speech picked up by the open mic
+# (e.g. "Paused. Say continue when ready.") can't trigger them
+_INTERRUPT_RE = re.compile(r"\b(?:stop|wait|pause)\b")
+
+# One precompiled matcher instead of ~15 interpreted substring scans per
+# turn: a pyahocorasick automaton when the package is around, otherwise a
+# compiled alternation (still a single linear pass over the utterance)
+try:
+    import ahocorasick
+
+    _COMMAND_AC = ahocorasick.Automaton()
+    for _kw, _entry in _COMMAND_TABLE.items():
+        _COMMAND_AC.add_word(_kw, _entry)
+    _COMMAND_AC.make_automaton()
+except ImportError:
+    _COMMAND_AC = None
+    _COMMAND_RE = re.compile(
+        "|".join(sorted(_COMMAND_TABLE, key=len, reverse=True))
+    )
+
 from models import Recipe, CookingSession, StepStatus
 from services.cooking_service import CookingService
 from data.sample_recipes import get_recipe
+from voice_assistant_base import get_tts_engine, get_recognizer, get_microphone
 
 class VoiceCookingAssistant:
     def __init__(self):
         print("🎤 Initializing voice cooking assistant...")
-        
-        # Initialize text-to-speech (single-threaded to avoid glitches)
-        try:
-            self.tts = pyttsx3.init()
-            self.setup_voice()
+        _import_audio_stack()
+
+        # Text-to-speech lives on a dedicated persistent engine thread; the
+        # main thread only enqueues text, so listening can resume while the
+        # tail of an utterance is still playing
+        self.tts = None
+        self._tts_queue = queue.Queue()
+        self._tts_pending = []
+        self._tts_ready = threading.Event()
+        self._tts_thread = threading.Thread(target=self._tts_loop, daemon=True)
+        self._tts_thread.start()
+        self._tts_ready.wait(timeout=10)
+        if self.tts:
             print("✅ Text-to-speech initialized")
-        except Exception as e:
-            print(f"❌ TTS error: {e}")
-            self.tts = None
         
         # Initialize speech recognition with longer timeouts
         try:
-            self.recognizer = sr.Recognizer()
-            self.microphone = sr.Microphone()
+            self.recognizer = get_recognizer()
+            self.microphone = get_microphone()
             self.setup_microphone()
             print("✅ Speech recognition initialized")
         except Exception as e:
             print(f"❌ Microphone error: {e}")
             self.microphone = None
         
+        # Local int8 Whisper loaded once at startup: per-turn recognition
+        # then never touches the network, and tiny.en decodes faster than
+        # real time on one CPU core
+        self._whisper_model = None
+        if WhisperModel is not None:
+            try:
+                self._whisper_model = WhisperModel(
+                    "tiny.en", device="cpu", compute_type="int8"
+                )
+                print("🧠 Using local Whisper for speech recognition")
+            except Exception as e:
+                print(f"⚠️  Local Whisper unavailable ({e}), using Google STT")
+
+        # Streaming speech client kept for the process lifetime so the
+        # gRPC channel (TCP + TLS handshake) is only set up once
+        self._speech_client = None
+        if gcs_speech is not None:
+            try:
+                self._speech_client = gcs_speech.SpeechClient()
+                print("✅ Streaming speech recognition ready")
+            except Exception as e:
+                print(f"⚠️  Streaming recognition unavailable ({e}), using Web Speech API")
+
         # Initialize cooking service
         self.cooking_service = CookingService()
-        
-        # Speech control (simplified to avoid threading issues)
+
+        # Worker pool for prep work that overlaps TTS playback
+        self._pool = ThreadPoolExecutor(max_workers=2)
+
+        # Tracked via the engine's utterance callbacks, not set by hand
         self.currently_speaking = False
-    
+
+        # Barge-in: a background listener keeps the microphone hot for the
+        # whole session; any speech it captures cuts in-flight TTS short,
+        # so the user never has to wait out a long response before talking
+        self._barge_queue = queue.Queue()
+        self._tts_interrupt = threading.Event()
+        self._stop_bg_listen = None
+        if self.microphone:
+            try:
+                self._stop_bg_listen = self.recognizer.listen_in_background(
+                    self.microphone, self._barge_callback
+                )
+                print("✅ Barge-in listener running")
+            except Exception as e:
+                print(f"⚠️  Background listener unavailable ({e})")
+
+    def _tts_loop(self):
+        """Persistent TTS worker: bring the engine up once, then drive its
+        event loop by hand while draining the text queue.
+
+        startLoop(False) + iterate() keeps a single engine alive for the
+        process lifetime, so there is no per-utterance stop()/sleep dance
+        and no runAndWait() block on the main thread.
+        """
+        try:
+            engine = get_tts_engine()
+            self.tts = engine
+            self.setup_voice()
+            engine.connect('started-utterance', self._on_utterance_start)
+            engine.connect('finished-utterance', self._on_utterance_end)
+        except Exception as e:
+            print(f"❌ TTS error: {e}")
+            self.tts = None
+            self._tts_ready.set()
+            return
+        self._tts_ready.set()
+
+        # Specialize to the demo's fixed phrase corpus: render anything
+        # missing from the WAV cache now (runAndWait is still legal before
+        # the manual loop starts), so playback later skips synthesis
+        try:
+            self._prerender_static_phrases(engine)
+        except Exception as e:
+            print(f"⚠️  TTS cache warning: {e}")
+
+        engine.startLoop(False)
+
+        while True:
+            if self._tts_interrupt.is_set():
+                engine.stop()
+                self._flush_tts()
+                self._tts_interrupt.clear()
+            try:
+                text, done = self._tts_queue.get(timeout=0.01)
+            except queue.Empty:
+                pass
+            else:
+                cached = self._tts_cache_path(text)
+                if simpleaudio is not None and cached and os.path.exists(cached):
+                    # Pre-rendered phrase: playback is just a wave file
+                    # handed to the sound card, no synthesis at all
+                    self._play_wav(cached, done)
+                else:
+                    self._tts_pending.append(done)
+                    engine.say(text)
+                self._tts_queue.task_done()
+            try:
+                engine.iterate()
+            except Exception as e:
+                print(f"⚠️  TTS error: {e}")
+
+    def _tts_cache_path(self, text):
+        """Cache file for a phrase under the currently selected voice."""
+        voice_id = getattr(self, '_voice_id', None)
+        if voice_id is None:
+            return None
+        key = hashlib.sha1((voice_id + text).encode()).hexdigest()
+        return os.path.join(_TTS_CACHE_DIR, key + ".wav")
+
+    def _static_phrases(self):
+        """Every sentence the demo can speak verbatim, split the same way
+        speak_simple splits them (the cache is keyed per sentence)."""
+        phrases = {
+            "Welcome to Foodingo! Your AI cooking assistant.",
+            "Sorry, couldn't load the recipe.",
+            "Perfect! Recipe completed!",
+            "Recipe complete! Enjoy your burgers!",
+            "Thanks for cooking!",
+            "Technical issue. Let's continue.",
+            "Cooking ended. Thanks!",
+            "Okay.",
+            _DEFAULT_RESPONSE["response"],
+        }
+        for _, response in _COMMAND_TABLE.values():
+            phrases.add(response["response"])
+        try:
+            recipe = get_recipe("classic_beef_burger")
+            phrases.add(f"Today we're making {recipe.name}. Ready to start?")
+            phrases.update(recipe.step_intros)
+            for step in recipe.steps:
+                phrases.add(step.instruction)
+                if step.tips:
+                    phrases.add(step.tips[0])
+        except Exception:
+            pass  # Dynamic text just falls back to live synthesis
+
+        sentences = set()
+        for phrase in phrases:
+            sentences.update(s for s in _SENTENCE_RE.split(phrase) if s)
+        return sentences
+
+    def _prerender_static_phrases(self, engine):
+        """Render the demo's fixed phrases to WAV once per voice."""
+        if simpleaudio is None:
+            return
+        os.makedirs(_TTS_CACHE_DIR, exist_ok=True)
+        rendered = 0
+        for sentence in self._static_phrases():
+            path = self._tts_cache_path(sentence)
+            if path and not os.path.exists(path):
+                engine.save_to_file(sentence, path)
+                rendered += 1
+        if rendered:
+            engine.runAndWait()
+            print(f"🔊 Pre-rendered {rendered} phrases to audio cache")
+
+    def _play_wav(self, path, done):
+        """Play a pre-rendered utterance, honoring barge-in interrupts."""
+        try:
+            self.currently_speaking = True
+            play = simpleaudio.WaveObject.from_wave_file(path).play()
+            while play.is_playing():
+                if self._tts_interrupt.is_set():
+                    play.stop()
+                    break
+                time.sleep(0.02)
+        except Exception as e:
+            print(f"⚠️  Cached audio error: {e}")
+        finally:
+            self.currently_speaking = False
+            done.set()
+
+    def _flush_tts(self):
+        """Drop queued utterances and wake anyone waiting on them."""
+        while True:
+            try:
+                _, done = self._tts_queue.get_nowait()
+            except queue.Empty:
+                break
+            self._tts_queue.task_done()
+            done.set()
+        while self._tts_pending:
+            self._tts_pending.pop(0).set()
+
+    def _on_utterance_start(self, name):
+        self.currently_speaking = True
+
+    def _on_utterance_end(self, name, completed):
+        self.currently_speaking = False
+        if self._tts_pending:
+            self._tts_pending.pop(0).set()
+
+    def _transcribe(self, audio):
+        """Transcribe one utterance, locally when Whisper is loaded.
+
+        The int8 Whisper path runs off the main thread (the ctranslate2
+        kernels release the GIL) and never touches the network; vad_filter
+        drops silent chunks before any decoding happens.
+        """
+        if self._whisper_model is not None:
+            samples = np.frombuffer(
+                audio.get_raw_data(convert_rate=16000, convert_width=2),
+                dtype=np.int16
+            ).astype(np.float32) / 32768.0
+            segments, _ = self._whisper_model.transcribe(
+                samples, language="en", beam_size=1, vad_filter=True
+            )
+            return " ".join(segment.text.strip() for segment in segments).strip()
+        return self.recognizer.recognize_google(audio)
+
+    def _barge_callback(self, recognizer, audio):
+        """Handle speech captured while the assistant may still be talking.
+
+        Without hardware echo cancellation the background listener hears
+        the assistant's own playback, and phrases like "Moving to the next
+        step" contain command keywords — acting on them would drive the
+        demo through the recipe by itself. So while TTS is active only an
+        explicit interrupt word cuts playback and gets queued; everything
+        else captured mid-speech is discarded as probable self-speech.
+        """
+        speaking = self.currently_speaking or not self._tts_queue.empty()
+        try:
+            text = self._transcribe(audio)
+        except sr.UnknownValueError:
+            return  # Noise, not speech
+        except sr.RequestError as e:
+            print(f"❌ Speech recognition error: {e}")
+            return
+        if not text:
+            return
+        if speaking:
+            if not _INTERRUPT_RE.search(text.lower()):
+                return
+            self._tts_interrupt.set()
+        print(f"👤 You said: '{text}'")
+        self._barge_queue.put(text)
+
+
+    def _voice_cache_key(self):
+        """Cache is only valid for the same platform + pyttsx3 build."""
+        return f"{platform.system()}-{getattr(pyttsx3, '__version__', '?')}"
+
+    def _load_voice_cache(self):
+        if "--recalibrate" in sys.argv:
+            return None
+        try:
+            with open(_VOICE_CACHE_PATH) as f:
+                cache = json.load(f)
+            if cache.get("key") == self._voice_cache_key():
+                return cache.get("voice_id")
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def _save_voice_cache(self, voice_id):
+        try:
+            os.makedirs(os.path.dirname(_VOICE_CACHE_PATH), exist_ok=True)
+            with open(_VOICE_CACHE_PATH, "w") as f:
+                json.dump({"key": self._voice_cache_key(), "voice_id": voice_id}, f)
+        except OSError:
+            pass  # Best-effort; next launch re-enumerates
+
+    def _pick_voice(self, voices):
+        """Select the best voice in one pass over the enumeration.
+
+        Sort key: preferred-name rank, then whether the name says English,
+        then enumeration order - so a single min() replaces the old nested
+        preferred x voices loop plus the second English-fallback pass.
+        """
+        best = None
+        for i, voice in enumerate(voices or ()):
+            name = voice.name.lower()
+            rank = next(
+                (r for p, r in _PREFERRED_VOICES.items() if p in name), 99
+            )
+            key = (rank, 'english' not in name, i)
+            if best is None or key < best[0]:
+                best = (key, voice)
+        # Only override the driver default if we found a preferred or
+        # explicitly English voice
+        if best and (best[0][0] < 99 or not best[0][1]):
+            print(f"✅ Selected voice: {best[1].name}")
+            return best[1].id
+        return None
+
     def setup_voice(self):
         """Configure text-to-speech with best voice"""
         if not self.tts:
             return
-            
+
+        self._voice_id = "default"
         try:
-            voices = self.tts.getProperty('voices')
-            
-            # Look for good voices
-            preferred_voices = ['samantha', 'alex', 'victoria', 'allison', 'ava', 'karen', 'moira']
-            best_voice = None
-            
-            if voices:
+            cached_id = self._load_voice_cache()
+            if cached_id:
+                self.tts.setProperty('voice', cached_id)
+                self._voice_id = cached_id
+            else:
+                # getProperty('voices') is one of the slowest pyttsx3 calls
+                # (IPC/COM/AppKit); only pay for it on a cache miss
                 print("🎭 Finding best voice...")
-                for voice in voices:
-                    voice_name = voice.name.lower()
-                    
-                    # Check for preferred voices
-                    for preferred in preferred_voices:
-                        if preferred in voice_name and 'english' in voice_name:
-                            best_voice = voice.id
-                            print(f"✅ Selected voice: {voice.name}")
-                            break
-                    if best_voice:
-                        break
-                
-                # Fallback to first English voice
-                if not best_voice:
-                    for voice in voices:
-                        if 'english' in voice.name.lower():
-                            best_voice = voice.id
-                            print(f"✅ Using voice: {voice.name}")
-                            break
-                
+                best_voice = self._pick_voice(self.tts.getProperty('voices'))
                 if best_voice:
                     self.tts.setProperty('voice', best_voice)
-            
+                    self._voice_id = best_voice
+                    self._save_voice_cache(best_voice)
+
             # Optimize speech settings to avoid glitches
             self.tts.setProperty('rate', 190)  # Good speed
             self.tts.setProperty('volume', 0.8)  # Slightly lower to avoid distortion
-            
+
         except Exception as e:
             print(f"⚠️  Voice setup warning: {e}")
     
+    def _load_mic_calibration(self):
+        """Return the cached energy threshold if it is fresh enough."""
+        if "--recalibrate" in sys.argv:
+            return None
+        try:
+            with open(_MIC_CAL_PATH) as f:
+                cal = json.load(f)
+            if time.time() - cal["ts"] < _MIC_CAL_MAX_AGE:
+                return float(cal["energy_threshold"])
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+    def _save_mic_calibration(self, threshold):
+        """Persist the measured threshold; best-effort only."""
+        try:
+            os.makedirs(os.path.dirname(_MIC_CAL_PATH), exist_ok=True)
+            with open(_MIC_CAL_PATH, "w") as f:
+                json.dump({"energy_threshold": threshold, "ts": time.time()}, f)
+        except OSError:
+            pass  # Next run just recalibrates
+
     def setup_microphone(self):
-        """Configure microphone with longer timeouts"""
+        """Configure microphone, reusing a recent calibration when available"""
         if not self.microphone:
             return
-            
+
         try:
-            print("🔧 Setting up microphone...")
-            
-            # Quick calibration
-            with self.microphone as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
-            
-            # Better recognition settings
-            self.recognizer.energy_threshold = 300
-            self.recognizer.dynamic_energy_threshold = True
-            self.recognizer.pause_threshold = 0.8  # Wait longer for pauses
-            
+            cached = self._load_mic_calibration()
+            if cached is not None:
+                # Skip the 1-second ambient-noise block entirely
+                self.recognizer.energy_threshold = cached
+                print(f"🔧 Using cached energy threshold ({cached:.0f})")
+            else:
+                print("🔧 Calibrating microphone...")
+                with self.microphone as source:
+                    self.recognizer.adjust_for_ambient_noise(source, duration=1)
+                self._save_mic_calibration(self.recognizer.energy_threshold)
+
+            # Once calibrated, keep the threshold fixed; dynamic adjustment
+            # is what makes listen() hang when ambient noise drifts
+            self.recognizer.dynamic_energy_threshold = False
+
+            # Commands here are one to three words ("next", "pause"), so
+            # end the utterance aggressively: 0.3s of silence closes it
+            # instead of the 0.8s default
+            self.recognizer.pause_threshold = 0.3
+            self.recognizer.non_speaking_duration = 0.3  # must be <= pause_threshold
+            # ...but keep very short phrases ("yes", "no") from being
+            # discarded as noise
+            self.recognizer.phrase_threshold = 0.2
+
             print("✅ Microphone ready!")
         except Exception as e:
             print(f"⚠️  Microphone setup warning: {e}")
     
-    def speak_simple(self, text):
-        """Simple speech without threading to avoid glitches"""
+    def speak_simple(self, text, wait=True):
+        """Queue text for the TTS worker; by default wait until it has played.
+
+        Pass wait=False to fire-and-forget so other work (listening, recipe
+        prep) can overlap the playback.
+
+        Multi-sentence responses are enqueued one sentence at a time: each
+        is its own engine.say() call, so a barge-in stop() cuts at the
+        current sentence instead of replaying or dropping the whole text.
+        """
         print(f"🤖 AI: {text}")
-        
+
         if not self.tts:
             print("🔇 (Text-to-speech not available)")
             return
-        
-        try:
-            self.currently_speaking = True
-            
-            # Stop any previous speech first
-            self.tts.stop()
-            time.sleep(0.1)  # Small pause to clear audio buffer
-            
-            # Speak in main thread to avoid conflicts
-            self.tts.say(text)
-            self.tts.runAndWait()
-            
-        except Exception as e:
-            print(f"⚠️  TTS error: {e}")
-        finally:
-            self.currently_speaking = False
+
+        done = None
+        for sentence in _SENTENCE_RE.split(text):
+            if sentence:
+                done = threading.Event()
+                self._tts_queue.put((sentence, done))
+        if wait and done is not None:
+            done.wait()
     
+    def _streaming_transcribe(self, source, timeout=10):
+        """Stream microphone chunks to Cloud Speech; return the first final transcript.
+
+        Transcription overlaps recording: ~100 ms frames are pushed to the
+        recognizer as PyAudio produces them, so the transcript is usually
+        ready the moment the user stops speaking, instead of after a full
+        record-then-upload round trip.
+        """
+        streaming_config = gcs_speech.StreamingRecognitionConfig(
+            config=gcs_speech.RecognitionConfig(
+                encoding=gcs_speech.RecognitionConfig.AudioEncoding.LINEAR16,
+                sample_rate_hertz=source.SAMPLE_RATE,
+                language_code="en-US",
+            ),
+            # Commands here are one to three words, so end the utterance
+            # aggressively and surface partials as they firm up
+            single_utterance=True,
+            interim_results=True,
+        )
+
+        deadline = time.monotonic() + timeout
+
+        def request_stream():
+            while time.monotonic() < deadline:
+                chunk = source.stream.read(source.CHUNK)
+                if not chunk:
+                    return
+                yield gcs_speech.StreamingRecognizeRequest(audio_content=chunk)
+
+        responses = self._speech_client.streaming_recognize(
+            streaming_config, request_stream()
+        )
+        for response in responses:
+            for result in response.results:
+                if result.is_final and result.alternatives:
+                    return result.alternatives[0].transcript.strip()
+        return None
+
     def listen_with_longer_timeout(self):
         """Listen with much longer timeout"""
         if not self.microphone:
             return None
-            
+
         try:
             print("🎤 Listening... (you have 10 seconds to speak)")
-            
+
             with self.microphone as source:
-                # Much longer timeout - 10 seconds to start speaking
-                # 10 seconds max phrase length
+                # Streaming path: recognition runs while the user is still
+                # talking, so there is no post-recording wait at all (local
+                # Whisper, when loaded, is already offline and near-instant)
+                if self._speech_client is not None and self._whisper_model is None:
+                    text = self._streaming_transcribe(source, timeout=10)
+                    if text:
+                        print(f"👤 You said: '{text}'")
+                        return text
+                    print("⏱️  No speech detected in 10 seconds")
+                    return None
+
+                # Short initial wait; the barge-in listener handles
+                # patience far more cheaply than listen()'s polling loop
                 audio = self.recognizer.listen(
-                    source, 
-                    timeout=10,  # 10 seconds to start speaking
+                    source,
+                    timeout=3,  # 3 seconds to start speaking
                     phrase_time_limit=10  # 10 seconds max phrase
                 )
-            
+
             print("🔄 Processing your speech...")
-            
+
             # Recognize speech
-            text = self.recognizer.recognize_google(audio)
+            text = self._transcribe(audio)
             print(f"👤 You said: '{text}'")
             return text
-            
+
         except sr.WaitTimeoutError:
             print("⏱️  No speech detected in 10 seconds")
             return None
@@ -180,8 +669,14 @@ class VoiceCookingAssistant:
         print("⌨️  Or just press Enter to type instead")
         print("="*50)
         
-        # Try voice input with long timeout
-        if self.microphone:
+        # The barge-in listener may already have captured (or be capturing)
+        # the user's phrase, possibly mid-TTS; prefer its queue
+        if self._stop_bg_listen is not None:
+            try:
+                return self._barge_queue.get(timeout=10)
+            except queue.Empty:
+                print("⏱️  No speech detected in 10 seconds")
+        elif self.microphone:
             voice_input = self.listen_with_longer_timeout()
             if voice_input:
                 return voice_input
@@ -195,73 +690,40 @@ class VoiceCookingAssistant:
     
     def mock_ai_response(self, user_input: str, session: CookingSession, recipe: Recipe):
         """Mock AI response with concise responses"""
-        user_input = user_input.lower()
-        
-        if "start" in user_input or "begin" in user_input:
-            return {
-                "response": "Perfect! Let's start cooking. First, season the ground beef in a large bowl.",
-                "action": "next_step"
-            }
-        elif "next" in user_input or "done" in user_input or "ready" in user_input:
-            return {
-                "response": "Great! Moving to the next step.",
-                "action": "next_step"
-            }
-        elif "pause" in user_input or "wait" in user_input:
-            return {
-                "response": "Paused. Say continue when ready.",
-                "action": "pause"
-            }
-        elif "resume" in user_input or "continue" in user_input:
-            return {
-                "response": "Continuing where we left off.",
-                "action": "resume"
-            }
-        elif "repeat" in user_input or "again" in user_input:
-            return {
-                "response": "Repeating current step.",
-                "action": "repeat_step"
-            }
-        elif "dropped" in user_input or "fell" in user_input or "disaster" in user_input:
-            return {
-                "response": "No worries! Kitchen accidents happen. Need to restart this step?",
-                "action": "pause"
-            }
-        elif "help" in user_input or "stuck" in user_input:
-            return {
-                "response": "I'm here to help! What's the problem?",
-                "action": "none"
-            }
-        elif "stop" in user_input or "quit" in user_input or "exit" in user_input:
-            return {
-                "response": "Thanks for cooking with me!",
-                "action": "complete_recipe"
-            }
+        low = user_input.lower()
+
+        if _COMMAND_AC is not None:
+            hits = (entry for _, entry in _COMMAND_AC.iter(low))
         else:
-            return {
-                "response": "Got it. Say help, next, or pause as needed.",
-                "action": "none"
-            }
+            hits = (_COMMAND_TABLE[m.group()] for m in _COMMAND_RE.finditer(low))
+
+        best = min(hits, key=lambda entry: entry[0], default=None)
+        if best is None:
+            return dict(_DEFAULT_RESPONSE)
+        return dict(best[1])
     
     def demo_voice_cooking(self):
         """Run the voice cooking demo"""
         
+        # The recipe loads while the welcome line is playing
+        recipe_fut = self._pool.submit(get_recipe, "classic_beef_burger")
+
         self.speak_simple("Welcome to Foodingo! Your AI cooking assistant.")
-        time.sleep(0.5)  # Pause between speeches
-        
-        # Get the burger recipe
-        recipe = get_recipe("classic_beef_burger")
+
+        recipe = recipe_fut.result()
         if not recipe:
             self.speak_simple("Sorry, couldn't load the recipe.")
             return
-        
-        self.speak_simple(f"Today we're making {recipe.name}. Ready to start?")
-        
+
         # Monkey patch the AI response for demo
         self.cooking_service.conversation_engine.generate_response = self.mock_ai_response
-        
-        # Start cooking session
-        session = self.cooking_service.start_cooking_session(recipe)
+
+        # Session setup likewise overlaps the second utterance
+        session_fut = self._pool.submit(
+            self.cooking_service.start_cooking_session, recipe
+        )
+        self.speak_simple(f"Today we're making {recipe.name}. Ready to start?")
+        session = session_fut.result()
         
         print("\n🎯 Voice Commands:")
         print("   • 'start' - Begin cooking")
@@ -296,24 +758,32 @@ class VoiceCookingAssistant:
                     self.speak_simple("Thanks for cooking!")
                     break
                 
-                # Process input
-                result = self.cooking_service.process_user_input(
-                    session_id=session.session_id,
-                    user_input=user_input,
-                    recipe=recipe
+                # Process input off-thread; if the backend takes noticeably
+                # long, speak a short filler so the user hears something
+                # within ~150ms of finishing their phrase
+                fut = self._pool.submit(
+                    asyncio.run,
+                    self.cooking_service.process_user_input(
+                        session_id=session.session_id,
+                        user_input=user_input,
+                        recipe=recipe
+                    )
                 )
+                try:
+                    result = fut.result(timeout=0.15)
+                except FutureTimeoutError:
+                    self.speak_simple("Okay.", wait=False)
+                    result = fut.result()
                 
-                # Speak response with pause
-                time.sleep(0.3)  # Small pause before responding
+                # The TTS worker queue serializes and naturally gaps
+                # utterances, so no sleeps are needed between them
                 self.speak_simple(result['response'])
-                
+
                 if result.get('session_update', {}).get('step_introduction'):
-                    time.sleep(0.5)
                     self.speak_simple(result['session_update']['step_introduction'])
-                
+
                 # Check completion
                 if session.current_step >= len(recipe.steps):
-                    time.sleep(0.5)
                     self.speak_simple("Perfect! Recipe completed!")
                     break
                     
@@ -335,10 +805,17 @@ def main():
     except Exception as e:
         print(f"❌ Error: {e}")
         print("Falling back to text demo...")
+        # Run the text demo in-process: everything it needs is already
+        # imported, so there is no interpreter relaunch to wait for
         try:
-            subprocess.run([sys.executable, "test_demo.py"])
-        except:
-            print("Run: python test_demo.py")
+            from test_demo import demo_cooking_session
+            demo_cooking_session()
+        except ImportError:
+            # Last resort: a fresh interpreter
+            try:
+                subprocess.run([sys.executable, "test_demo.py"])
+            except:
+                print("Run: python test_demo.py")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
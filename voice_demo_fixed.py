@@ -5,28 +5,97 @@ This version properly handles microphone access and threading
 """
 
 import sys
+import asyncio
+import atexit
 import os
 import threading
 import time
 import queue
 import select
-import speech_recognition as sr
-import pyttsx3
 from datetime import datetime
 
+# speech_recognition/pyttsx3 load PortAudio and the platform speech
+# framework; defer them to construction so importing this module for
+# tests or tooling stays instant
+sr = None
+
+
+def _import_audio_stack():
+    """Load the heavy audio/speech modules on first use."""
+    global sr
+    if sr is None:
+        import speech_recognition
+        sr = speech_recognition
+
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Demo responses built once at import: keywords that mean the same thing
+# alias the same dict object, so the per-turn scan allocates nothing and
+# adding a phrase is one table entry
+_START_RESPONSE = {
+    "response": "Perfect! Let's start cooking together. First, we'll season the ground beef. Get your mixing bowl ready!",
+    "action": "next_step"
+}
+_NEXT_RESPONSE = {
+    "response": "Excellent work! Let's move on to the next step.",
+    "action": "next_step"
+}
+_PAUSE_RESPONSE = {
+    "response": "No problem! I'll pause right here. Take your time, and say 'continue' when you're ready.",
+    "action": "pause"
+}
+_RESUME_RESPONSE = {
+    "response": "Great! Welcome back. Let's pick up where we left off.",
+    "action": "resume"
+}
+_REPEAT_RESPONSE = {
+    "response": "Of course! Let me repeat the current step.",
+    "action": "repeat_step"
+}
+_DISASTER_RESPONSE = {
+    "response": "Oh no! Don't worry - kitchen accidents happen. Take a deep breath. Do you need to start this step over?",
+    "action": "pause"
+}
+_HELP_RESPONSE = {
+    "response": "I'm here to help! What's going on? Tell me what you're having trouble with.",
+    "action": "none"
+}
+_STOP_RESPONSE = {
+    "response": "Thanks for cooking with me! Hope to help you again soon.",
+    "action": "complete_recipe"
+}
+_DEFAULT_RESPONSE = {
+    "response": "I understand. Let me know if you need help, want to continue, or need to pause.",
+    "action": "none"
+}
+
+# Insertion order mirrors the old elif ladder, so the first keyword found
+# wins exactly as before
+_RESPONSES = {
+    "start": _START_RESPONSE, "begin": _START_RESPONSE,
+    "next": _NEXT_RESPONSE, "done": _NEXT_RESPONSE, "ready": _NEXT_RESPONSE,
+    "pause": _PAUSE_RESPONSE, "wait": _PAUSE_RESPONSE, "hold": _PAUSE_RESPONSE,
+    "resume": _RESUME_RESPONSE, "continue": _RESUME_RESPONSE,
+    "repeat": _REPEAT_RESPONSE, "again": _REPEAT_RESPONSE,
+    "dropped": _DISASTER_RESPONSE, "fell": _DISASTER_RESPONSE,
+    "disaster": _DISASTER_RESPONSE,
+    "help": _HELP_RESPONSE, "stuck": _HELP_RESPONSE,
+    "stop": _STOP_RESPONSE, "quit": _STOP_RESPONSE, "exit": _STOP_RESPONSE,
+}
+
 from models import Recipe, CookingSession, StepStatus
 from services.cooking_service import CookingService
 from data.sample_recipes import get_recipe
+from voice_assistant_base import get_tts_engine, get_recognizer, get_microphone
 
 class VoiceCookingAssistant:
     def __init__(self):
         print("🎤 Initializing voice cooking assistant...")
-        
+        _import_audio_stack()
+
         # Initialize text-to-speech first
         try:
-            self.tts = pyttsx3.init()
+            self.tts = get_tts_engine()
             self.setup_voice()
             print("✅ Text-to-speech initialized")
         except Exception as e:
@@ -35,13 +104,19 @@ class VoiceCookingAssistant:
         
         # Initialize speech recognition
         try:
-            self.recognizer = sr.Recognizer()
-            self.microphone = sr.Microphone()
+            self.recognizer = get_recognizer()
+            self.microphone = get_microphone()
+            # Open the microphone stream once for the process lifetime;
+            # re-opening the device on every listen costs tens to hundreds
+            # of milliseconds and occasionally fails on a rapid reopen
+            self._source = self.microphone.__enter__()
+            atexit.register(self.microphone.__exit__, None, None, None)
             self.calibrate_microphone()
             print("✅ Speech recognition initialized")
         except Exception as e:
             print(f"❌ Microphone error: {e}")
             self.microphone = None
+            self._source = None
         
         # Initialize cooking service
         self.cooking_service = CookingService()
@@ -79,8 +154,7 @@ class VoiceCookingAssistant:
             
         try:
             print("🔧 Calibrating microphone...")
-            with self.microphone as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
+            self.recognizer.adjust_for_ambient_noise(self._source, duration=1)
             print("✅ Microphone calibrated!")
         except Exception as e:
             print(f"⚠️  Microphone calibration warning: {e}")
@@ -105,9 +179,8 @@ class VoiceCookingAssistant:
             
         try:
             print("🎤 Listening... (speak now)")
-            with self.microphone as source:
-                # Listen for audio with timeout
-                audio = self.recognizer.listen(source, timeout=3, phrase_time_limit=8)
+            # Listen on the stream opened at startup; no per-turn device open
+            audio = self.recognizer.listen(self._source, timeout=3, phrase_time_limit=8)
             
             # Recognize speech
             text = self.recognizer.recognize_google(audio)
@@ -146,53 +219,12 @@ class VoiceCookingAssistant:
     
     def mock_ai_response(self, user_input: str, session: CookingSession, recipe: Recipe):
         """Mock AI response with natural speech patterns"""
-        user_input = user_input.lower()
-        
-        if "start" in user_input or "begin" in user_input:
-            return {
-                "response": "Perfect! Let's start cooking together. First, we'll season the ground beef. Get your mixing bowl ready!",
-                "action": "next_step"
-            }
-        elif "next" in user_input or "done" in user_input or "ready" in user_input:
-            return {
-                "response": "Excellent work! Let's move on to the next step.",
-                "action": "next_step"
-            }
-        elif "pause" in user_input or "wait" in user_input or "hold" in user_input:
-            return {
-                "response": "No problem! I'll pause right here. Take your time, and say 'continue' when you're ready.",
-                "action": "pause"
-            }
-        elif "resume" in user_input or "continue" in user_input:
-            return {
-                "response": "Great! Welcome back. Let's pick up where we left off.",
-                "action": "resume"
-            }
-        elif "repeat" in user_input or "again" in user_input:
-            return {
-                "response": "Of course! Let me repeat the current step.",
-                "action": "repeat_step"
-            }
-        elif "dropped" in user_input or "fell" in user_input or "disaster" in user_input:
-            return {
-                "response": "Oh no! Don't worry - kitchen accidents happen. Take a deep breath. Do you need to start this step over?",
-                "action": "pause"
-            }
-        elif "help" in user_input or "stuck" in user_input:
-            return {
-                "response": "I'm here to help! What's going on? Tell me what you're having trouble with.",
-                "action": "none"
-            }
-        elif "stop" in user_input or "quit" in user_input or "exit" in user_input:
-            return {
-                "response": "Thanks for cooking with me! Hope to help you again soon.",
-                "action": "complete_recipe"
-            }
-        else:
-            return {
-                "response": "I understand. Let me know if you need help, want to continue, or need to pause.",
-                "action": "none"
-            }
+        low = user_input.lower()
+
+        for keyword, response in _RESPONSES.items():
+            if keyword in low:
+                return response
+        return _DEFAULT_RESPONSE
     
     def demo_voice_cooking(self):
         """Run the voice-enabled cooking demo"""
@@ -241,11 +273,11 @@ class VoiceCookingAssistant:
                     break
                 
                 # Process input
-                result = self.cooking_service.process_user_input(
+                result = asyncio.run(self.cooking_service.process_user_input(
                     session_id=session.session_id,
                     user_input=user_input,
                     recipe=recipe
-                )
+                ))
                 
                 # Speak the response
                 self.speak(result['response'])
@@ -280,11 +312,18 @@ def main():
     except Exception as e:
         print(f"❌ Error: {e}")
         print("\nFalling back to text-only demo...")
+        # Run the text demo in-process: everything it needs is already
+        # imported, so there is no interpreter relaunch to wait for
         try:
-            import subprocess
-            subprocess.run([sys.executable, "test_demo.py"])
-        except:
-            print("Please run: python test_demo.py")
+            from test_demo import demo_cooking_session
+            demo_cooking_session()
+        except ImportError:
+            # Last resort: a fresh interpreter
+            try:
+                import subprocess
+                subprocess.run([sys.executable, "test_demo.py"])
+            except:
+                print("Please run: python test_demo.py")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -4,107 +4,275 @@ Improved voice-enabled demo with better voice, message skipping, and faster resp
 """
 
 import sys
+import asyncio
+import json
+import multiprocessing
 import os
+import re
 import threading
 import time
 import queue
 import select
+import selectors
 import speech_recognition as sr
 import pyttsx3
+from concurrent.futures import Future
 from datetime import datetime
 import subprocess
 
+# Local streaming recognition is optional; without vosk installed the
+# demo keeps using the Google Web Speech API
+try:
+    import vosk
+except ImportError:
+    vosk = None
+
+# Streaming Cloud Speech is the next preference when vosk is absent
+try:
+    from google.cloud import speech as gcs_speech
+except ImportError:
+    gcs_speech = None
+
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Words that may cut speech short when heard mid-utterance
+_INTERRUPT_WORDS = ('skip', 'stop', 'next', 'continue')
+
+# Commands that end the session; frozenset membership, built once
+_QUIT_SET = frozenset(('quit', 'exit', 'stop'))
+
+# Sentence boundaries for TTS queuing; splitting after the punctuation
+# keeps it attached, so no per-sentence string rebuild is needed
+_SENT_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Preferred (natural-sounding) voices, matched in one pass per voice name
+_PREF_RE = re.compile(r'samantha|alex|victoria|allison|ava', re.I)
+
+
+def _tts_process_main(conn):
+    """Entry point for the pyttsx3 child process.
+
+    The child owns its own engine, so the driver's event loop and its
+    threading quirks are isolated from recognition and business logic
+    in the parent. Protocol: recv text, speak it, send a done ack; the
+    parent interrupts by terminating the process and respawning.
+    """
+    engine = pyttsx3.init()
+    try:
+        voices = engine.getProperty('voices')
+        debug = bool(os.environ.get('DEBUG'))
+        best_voice = None
+        if voices:
+            # One regex pass per voice name instead of a nested scan
+            # over the preference list
+            for voice in voices:
+                if debug:
+                    print(f"🎭 Available voice: {voice.name}")
+                if _PREF_RE.search(voice.name):
+                    best_voice = voice.id
+                    print(f"✅ Selected voice: {voice.name}")
+                    break
+            # If no preferred voice found, use the first one
+            if not best_voice:
+                best_voice = voices[0].id
+                print(f"✅ Using default voice: {voices[0].name}")
+            engine.setProperty('voice', best_voice)
+        engine.setProperty('rate', 200)  # Slightly faster
+        engine.setProperty('volume', 0.9)
+    except Exception as e:
+        print(f"⚠️  Voice setup warning: {e}")
+
+    while True:
+        text = conn.recv()
+        try:
+            # Sentence boundaries still matter: say/runAndWait per text,
+            # queued sentence by sentence for natural pacing
+            for sentence in _SENT_RE.split(text):
+                engine.say(sentence)
+            engine.runAndWait()
+        except Exception as e:
+            print(f"⚠️  TTS error: {e}")
+        conn.send(True)
+
 from models import Recipe, CookingSession, StepStatus
 from services.cooking_service import CookingService
 from data.sample_recipes import get_recipe
 
+class RecognitionService:
+    """Process-wide recognition front end shared by all assistants.
+
+    One worker thread owns the decoder: callers push an utterance and
+    get a Future back, and the worker drains whatever has queued up per
+    wake-up (up to batch_size). A single demo sees plain serialized
+    calls; several assistants in one process — e.g. per-user sessions
+    in a server — share one recognizer and its warm connection instead
+    of each holding their own.
+    """
+
+    def __init__(self, recognizer, batch_size=8):
+        self._recognizer = recognizer
+        self._batch_size = batch_size
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def push(self, audio):
+        """Queue one utterance; the Future resolves to its transcript."""
+        fut = Future()
+        self._queue.put((audio, fut))
+        return fut
+
+    def _worker(self):
+        while True:
+            jobs = [self._queue.get()]
+            while len(jobs) < self._batch_size:
+                try:
+                    jobs.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            for audio, fut in jobs:
+                try:
+                    fut.set_result(self._recognizer.recognize_google(audio))
+                except Exception as e:
+                    fut.set_exception(e)
+
+
+# The shared service is built lazily around the first recognizer seen
+_rec_service = None
+
+
+def get_recognition_service(recognizer):
+    """The process-wide RecognitionService, created on first use."""
+    global _rec_service
+    if _rec_service is None:
+        _rec_service = RecognitionService(recognizer)
+    return _rec_service
+
+
 class VoiceCookingAssistant:
     def __init__(self):
         print("🎤 Initializing improved voice cooking assistant...")
-        
-        # Initialize text-to-speech with better voice
-        try:
-            self.tts = pyttsx3.init()
-            self.setup_better_voice()
-            print("✅ Text-to-speech initialized")
-        except Exception as e:
-            print(f"❌ TTS error: {e}")
-            self.tts = None
+
+        # On macOS, drive the native 'say' command directly: pyttsx3 sits
+        # on NSSpeechSynthesizer via PyObjC, which serializes with its own
+        # event loop, while a 'say' subprocess can be terminate()-d for an
+        # instant interrupt and costs nothing to initialize
+        self._tts_proc = None
+        self._tts_conn = None
+        self._tts_process = None
+        self._say_voice = None
+        self._use_say = sys.platform == "darwin"
+        # Pre-synthesized audio, keyed by utterance text; filled during
+        # idle waits so known-next lines play back without synthesis
+        self._prefetch_cache = {}
+        if self._use_say:
+            self._say_voice = self._pick_say_voice()
+            print("✅ Text-to-speech via native 'say'")
+        else:
+            # pyttsx3 runs in its own process: its driver event loop and
+            # GIL traffic never compete with recognition here, and
+            # interruption is a terminate() away
+            try:
+                self._spawn_tts_process()
+                print("✅ Text-to-speech initialized")
+            except Exception as e:
+                print(f"❌ TTS error: {e}")
         
         # Initialize speech recognition with faster settings
         try:
             self.recognizer = sr.Recognizer()
             self.microphone = sr.Microphone()
             self.setup_fast_recognition()
+            self._rec_service = get_recognition_service(self.recognizer)
             print("✅ Speech recognition initialized")
         except Exception as e:
             print(f"❌ Microphone error: {e}")
             self.microphone = None
         
+        # Local streaming recognizer when vosk is installed: chunks are
+        # decoded as they arrive, partial hypotheses included, with no
+        # network round trip at all
+        self._vosk_rec = None
+        self.last_partial = ""
+        if vosk is not None and self.microphone:
+            try:
+                vosk.SetLogLevel(-1)
+                self._vosk_rec = vosk.KaldiRecognizer(
+                    vosk.Model(lang="en-us"), self.microphone.SAMPLE_RATE
+                )
+                print("🧠 Using local Vosk recognizer")
+            except Exception as e:
+                print(f"⚠️  Vosk unavailable ({e}), using Google STT")
+
+        # Streaming Cloud Speech when vosk is absent but the client library
+        # is around; the channel is kept so the handshake is paid once
+        self._speech_client = None
+        if self._vosk_rec is None and gcs_speech is not None and self.microphone:
+            try:
+                self._speech_client = gcs_speech.SpeechClient()
+                print("✅ Streaming speech recognition ready")
+            except Exception as e:
+                print(f"⚠️  Streaming recognition unavailable ({e})")
+
+        # When the blocking cloud recognizer will be used, pay its DNS +
+        # connection setup now rather than on the first real utterance
+        if self._vosk_rec is None and self._speech_client is None and self.microphone:
+            self._warm_google_endpoint()
+
+        # Non-blocking keyboard fallback: stdin registered with a
+        # selector so typing is polled rather than blocking in input()
+        self._sel = None
+        try:
+            self._sel = selectors.DefaultSelector()
+            self._sel.register(sys.stdin, selectors.EVENT_READ)
+        except (ValueError, OSError):
+            self._sel = None  # stdin not selectable (e.g. redirected)
+
         # Initialize cooking service
         self.cooking_service = CookingService()
-        
-        # Speech control
+
+        # Speech control: one persistent worker owns all engine calls.
+        # Utterances are queued to it, and _tts_done flips when playback
+        # has drained - no per-utterance thread creation, no polling.
         self.speaking = False
         self.should_stop_speaking = False
-        self.speech_thread = None
+        self._tts_queue = queue.Queue()
+        self._tts_done = threading.Event()
+        self._tts_done.set()
+        self._tts_thread = threading.Thread(target=self._tts_worker, daemon=True)
+        self._tts_thread.start()
     
-    def setup_better_voice(self):
-        """Configure text-to-speech with the best available voice"""
-        if not self.tts:
-            return
-            
+    def _spawn_tts_process(self):
+        """Start (or restart) the pyttsx3 child process."""
+        self._tts_conn, child_conn = multiprocessing.Pipe()
+        self._tts_process = multiprocessing.Process(
+            target=_tts_process_main, args=(child_conn,), daemon=True
+        )
+        self._tts_process.start()
+
+    def _pick_say_voice(self):
+        """Pick the best installed macOS voice for the 'say' command."""
+        preferred_voices = ['samantha', 'alex', 'victoria', 'allison', 'ava']
         try:
-            voices = self.tts.getProperty('voices')
-            
-            # Look for better voices (prefer female, natural-sounding ones)
-            preferred_voices = ['samantha', 'alex', 'victoria', 'allison', 'ava']
-            best_voice = None
-            
-            if voices:
-                for voice in voices:
-                    voice_name = voice.name.lower()
-                    print(f"🎭 Available voice: {voice.name}")
-                    
-                    # Check for preferred voices
-                    for preferred in preferred_voices:
-                        if preferred in voice_name:
-                            best_voice = voice.id
-                            print(f"✅ Selected voice: {voice.name}")
-                            break
-                    if best_voice:
-                        break
-                
-                # If no preferred voice found, use the first one
-                if not best_voice and voices:
-                    best_voice = voices[0].id
-                    print(f"✅ Using default voice: {voices[0].name}")
-                
-                if best_voice:
-                    self.tts.setProperty('voice', best_voice)
-            
-            # Optimize speech settings
-            self.tts.setProperty('rate', 200)  # Slightly faster
-            self.tts.setProperty('volume', 0.9)
-            
+            listing = subprocess.run(
+                ["say", "-v", "?"], capture_output=True, text=True
+            ).stdout.lower()
+            for preferred in preferred_voices:
+                if preferred in listing:
+                    return preferred.capitalize()
         except Exception as e:
-            print(f"⚠️  Voice setup warning: {e}")
-    
+            print(f"⚠️  Voice listing warning: {e}")
+        return None  # 'say' falls back to the system default voice
+
     def setup_fast_recognition(self):
         """Configure speech recognition for faster response"""
         if not self.microphone:
             return
             
         try:
-            print("🔧 Calibrating microphone for fast response...")
-            
-            # Faster calibration
-            with self.microphone as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-            
-            # Optimize recognition settings
+            # No ambient-noise calibration pass: it costs half a second of
+            # blocking capture at startup, and dynamic_energy_threshold
+            # converges to the room level within the first utterance anyway
             self.recognizer.energy_threshold = 300  # Lower threshold for faster detection
             self.recognizer.dynamic_energy_threshold = True
             self.recognizer.pause_threshold = 0.5  # Shorter pause detection
@@ -112,75 +280,252 @@ class VoiceCookingAssistant:
             print("✅ Microphone optimized for speed!")
         except Exception as e:
             print(f"⚠️  Microphone setup warning: {e}")
+
+    def _warm_google_endpoint(self):
+        """Pre-pay DNS resolution and connection setup to the Web Speech
+        endpoint while the assistant is still starting up.
+
+        A 200ms silence clip drives the full request path in a daemon
+        thread; the first real utterance then reuses the resolver cache
+        and any TLS session state instead of paying the handshake on the
+        interactive path.
+        """
+        def _prime():
+            silence = sr.AudioData(b"\x00\x00" * 3200, 16000, 2)
+            try:
+                self.recognizer.recognize_google(silence)
+            except Exception:
+                pass  # Expected: there is nothing to recognize in silence
+
+        threading.Thread(target=_prime, daemon=True).start()
     
-    def speak_interruptible(self, text):
-        """Speak text but allow interruption"""
+    def _tts_worker(self):
+        """Persistent worker thread that owns all speech dispatch.
+
+        Pulling from a queue means utterances never pay thread-creation
+        cost, and _tts_done gives waiters a real signal instead of a
+        100ms poll.
+        """
+        while True:
+            text = self._tts_queue.get()
+            try:
+                self._speak_blocking(text)
+            finally:
+                self._tts_queue.task_done()
+                if self._tts_queue.empty():
+                    self.speaking = False
+                    self._tts_done.set()
+
+    async def speak_interruptible(self, text):
+        """Speak text but allow interruption.
+
+        The utterance is handed to the persistent TTS worker and this
+        coroutine returns immediately, so listening and the
+        cooking-service call overlap the audio tail. Wait on _tts_done
+        where a hard ordering barrier is needed.
+        """
         print(f"🤖 AI: {text}")
-        
-        if not self.tts:
+
+        if self._tts_process is None and not self._use_say:
             print("🔇 (Text-to-speech not available)")
             return
-        
+
         self.speaking = True
         self.should_stop_speaking = False
-        
-        def speak_in_thread():
+        self._tts_done.clear()
+        self._tts_queue.put(text)
+
+    def _speak_blocking(self, text):
+        """Synchronous playback (runs off the loop).
+
+        On macOS the text is piped to a 'say' subprocess; elsewhere it
+        is sent to the pyttsx3 child process and this blocks on its done
+        ack. Either way stop_speaking can kill the speaking process
+        outright for an immediate interrupt.
+        """
+        if self._use_say:
             try:
-                # Split text into chunks for interruptibility
-                sentences = text.split('. ')
-                
-                for i, sentence in enumerate(sentences):
-                    if self.should_stop_speaking:
-                        print("⏸️  Speech interrupted")
+                # A pre-rendered intro may be the whole utterance or its
+                # tail (responses are coalesced with the intro); only the
+                # unrendered head goes through synthesis
+                head, cached = text, None
+                for key, path in self._prefetch_cache.items():
+                    if text.endswith(key) and os.path.exists(path):
+                        head, cached = text[:-len(key)].rstrip(), path
                         break
-                    
-                    # Add period back if not last sentence
-                    if i < len(sentences) - 1:
-                        sentence += '.'
-                    
-                    self.tts.say(sentence)
-                    self.tts.runAndWait()
-                    
-                    # Small pause between sentences to check for interruption
-                    time.sleep(0.1)
-                    
+                if head:
+                    cmd = ["say", "-r", "200"]
+                    if self._say_voice:
+                        cmd += ["-v", self._say_voice]
+                    self._tts_proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+                    self._tts_proc.communicate(head.encode())
+                if cached and not self.should_stop_speaking:
+                    self._tts_proc = subprocess.Popen(["afplay", cached])
+                    self._tts_proc.wait()
             except Exception as e:
                 print(f"⚠️  TTS error: {e}")
-            finally:
-                self.speaking = False
-        
-        # Start speaking in background thread
-        self.speech_thread = threading.Thread(target=speak_in_thread)
-        self.speech_thread.daemon = True
-        self.speech_thread.start()
-    
+            return
+
+        try:
+            self._tts_conn.send(text)
+            self._tts_conn.recv()  # Done ack; blocks for playback length
+        except (EOFError, BrokenPipeError, OSError):
+            pass  # Child was terminated mid-utterance (interrupt)
+        except Exception as e:
+            print(f"⚠️  TTS error: {e}")
+
+    def _prefetch_step_audio(self, recipe, idx):
+        """Pre-synthesize step idx's introduction while the user is busy.
+
+        The next introduction is deterministic (recipe.step_intros is
+        precomputed), so rendering it to disk during the idle wait makes
+        playback instant when next_step fires. Only wired to the 'say'
+        path, where synthesis and playback are separate commands.
+        """
+        if not self._use_say or not (0 <= idx < recipe.step_count):
+            return
+        text = recipe.step_intros[idx]
+        if text in self._prefetch_cache:
+            return
+
+        def _render():
+            path = f"/tmp/foodingo_step_{idx}.aiff"
+            cmd = ["say", "-r", "200", "-o", path]
+            if self._say_voice:
+                cmd += ["-v", self._say_voice]
+            try:
+                subprocess.run(cmd, input=text.encode(), check=True)
+                self._prefetch_cache[text] = path
+            except Exception:
+                pass  # Synthesis on demand still works
+
+        threading.Thread(target=_render, daemon=True).start()
+
     def stop_speaking(self):
         """Stop current speech"""
         if self.speaking:
             self.should_stop_speaking = True
-            if self.tts:
+            # O(1) kill of whichever process is speaking; pyttsx3's own
+            # stop() only flushes its queue at an utterance boundary
+            if self._tts_proc and self._tts_proc.poll() is None:
                 try:
-                    self.tts.stop()
-                except:
+                    self._tts_proc.terminate()
+                except Exception:
                     pass
+            if self._tts_process is not None and self._tts_process.is_alive():
+                try:
+                    self._tts_process.terminate()
+                finally:
+                    # Respawn so the next utterance has a worker ready
+                    self._spawn_tts_process()
             print("🤫 Speech stopped")
     
-    def listen_fast(self):
+    def _listen_vosk(self, phrase_limit=5.0, interrupt_words=None):
+        """Stream microphone chunks through the local Vosk recognizer.
+
+        Decoding overlaps capture, so the transcript is ready about when
+        the user stops talking; partial hypotheses let interrupt words be
+        acted on before endpointing even finishes.
+        """
+        with self.microphone as source:
+            self._vosk_rec.Reset()
+            deadline = time.monotonic() + phrase_limit
+            while time.monotonic() < deadline:
+                data = source.stream.read(4000)
+                if self._vosk_rec.AcceptWaveform(data):
+                    text = json.loads(self._vosk_rec.Result()).get("text", "")
+                    if text:
+                        return text
+                    continue
+                partial = json.loads(self._vosk_rec.PartialResult()).get("partial", "")
+                self.last_partial = partial
+                if interrupt_words and any(w in partial for w in interrupt_words):
+                    # A command word doesn't need to wait for endpointing
+                    return partial
+            return json.loads(self._vosk_rec.FinalResult()).get("text", "") or None
+
+    def _streaming_transcribe(self, source, timeout=5.0):
+        """Stream microphone chunks to Cloud Speech; return the first final
+        transcript. Recognition overlaps capture, so the transcript is
+        usually ready the moment the user stops speaking."""
+        streaming_config = gcs_speech.StreamingRecognitionConfig(
+            config=gcs_speech.RecognitionConfig(
+                encoding=gcs_speech.RecognitionConfig.AudioEncoding.LINEAR16,
+                sample_rate_hertz=source.SAMPLE_RATE,
+                language_code="en-US",
+            ),
+            single_utterance=True,
+            interim_results=True,
+        )
+
+        deadline = time.monotonic() + timeout
+
+        def request_stream():
+            while time.monotonic() < deadline:
+                chunk = source.stream.read(source.CHUNK)
+                if not chunk:
+                    return
+                yield gcs_speech.StreamingRecognizeRequest(audio_content=chunk)
+
+        responses = self._speech_client.streaming_recognize(
+            streaming_config, request_stream()
+        )
+        for response in responses:
+            for result in response.results:
+                # Interim hypotheses land here first; keep the latest so
+                # interrupt words can be inspected mid-utterance
+                if result.alternatives:
+                    self.last_partial = result.alternatives[0].transcript
+                if result.is_final and result.alternatives:
+                    return result.alternatives[0].transcript.strip()
+        return None
+
+    async def listen_fast(self, phrase_limit=5.0, timeout=2.0):
+        """Fast voice recognition without blocking the event loop.
+
+        Callers that expect only a short command word pass a smaller
+        phrase_limit so endpointing (and any upload) happens sooner.
+        """
+        return await asyncio.to_thread(self._listen_blocking, phrase_limit, timeout)
+
+    def _listen_blocking(self, phrase_limit=5.0, timeout=2.0):
         """Fast voice recognition with reduced timeouts"""
         if not self.microphone:
             return None
-            
+
         try:
             print("🎤 Listening... (speak now)")
-            
+
+            # Local streaming path: no post-capture recognition wait
+            if self._vosk_rec is not None:
+                text = self._listen_vosk(phrase_limit)
+                if text:
+                    print(f"👤 You said: {text}")
+                    return text
+                print("⏱️  No speech detected")
+                return None
+
+            # Cloud streaming path: transcription overlaps capture
+            if self._speech_client is not None:
+                with self.microphone as source:
+                    text = self._streaming_transcribe(source, timeout=phrase_limit)
+                if text:
+                    print(f"👤 You said: {text}")
+                    return text
+                print("⏱️  No speech detected")
+                return None
+
             with self.microphone as source:
                 # Much faster listening - reduced timeouts
-                audio = self.recognizer.listen(source, timeout=2, phrase_time_limit=5)
+                audio = self.recognizer.listen(
+                    source, timeout=timeout, phrase_time_limit=phrase_limit
+                )
             
             print("🔄 Processing speech...")
-            
-            # Recognize speech
-            text = self.recognizer.recognize_google(audio)
+
+            # Recognize through the shared service; result() re-raises
+            # recognition errors for the handlers below
+            text = self._rec_service.push(audio).result()
             print(f"👤 You said: {text}")
             return text
             
@@ -197,108 +542,125 @@ class VoiceCookingAssistant:
             print(f"❌ Microphone error: {e}")
             return None
     
-    def get_input_fast(self):
+    async def get_input_fast(self):
         """Get input with interrupt capability"""
         print("\n💬 Say something (or type):")
         print("💡 Say 'skip' to interrupt speech, 'next' to continue")
-        
+
         # If currently speaking, listen for interruption
         if self.speaking:
             print("🎤 Listening for interruption...")
-            voice_input = self.listen_fast()
-            
+            # Only a short command word is expected here, so a tight
+            # phrase limit endpoints quickly instead of padding silence
+            if self._vosk_rec is not None:
+                # Partial hypotheses catch command words mid-utterance
+                voice_input = await asyncio.to_thread(
+                    self._listen_vosk, 1.5, _INTERRUPT_WORDS
+                )
+            else:
+                voice_input = await self.listen_fast(phrase_limit=1.5, timeout=1.0)
+
             if voice_input:
                 voice_lower = voice_input.lower()
-                if any(word in voice_lower for word in ['skip', 'stop', 'next', 'continue']):
+                if any(word in voice_lower for word in _INTERRUPT_WORDS):
                     self.stop_speaking()
                     return voice_input
-        
-        # Wait for speech to finish if not interrupted
+
+        # Wait for speech to finish if not interrupted (no polling; the
+        # TTS worker sets the event once its queue drains)
         if self.speaking:
             print("⏳ Waiting for speech to finish...")
-            while self.speaking:
-                time.sleep(0.1)
-        
+            await asyncio.to_thread(self._tts_done.wait)
+
         # Now listen for main input
         if self.microphone:
-            voice_input = self.listen_fast()
+            voice_input = await self.listen_fast()
             if voice_input:
                 return voice_input
-        
-        # Fallback to keyboard
-        print("⌨️  Type your response:")
+
+        # Fallback to keyboard, polled through the selector so the
+        # process never blocks inside input(): voice can still preempt
+        # the typing path between 100ms stdin polls
+        print("⌨️  Type your response (or just speak):")
         try:
-            return input("You: ").strip()
+            while True:
+                if self._sel is not None:
+                    events = await asyncio.to_thread(self._sel.select, 0.1)
+                    if events:
+                        line = sys.stdin.readline().strip()
+                        if line:
+                            return line
+                else:
+                    return (await asyncio.to_thread(input, "You: ")).strip()
+
+                if self.microphone:
+                    voice_input = await self.listen_fast()
+                    if voice_input:
+                        return voice_input
         except KeyboardInterrupt:
             return "quit"
     
-    def mock_ai_response(self, user_input: str, session: CookingSession, recipe: Recipe):
-        """Mock AI response with shorter, more natural responses"""
-        user_input = user_input.lower()
-        
-        if "start" in user_input or "begin" in user_input:
-            return {
-                "response": "Perfect! Let's start cooking. First, season the ground beef in a large bowl.",
-                "action": "next_step"
-            }
-        elif "next" in user_input or "done" in user_input or "ready" in user_input:
-            return {
-                "response": "Great job! Moving to the next step.",
-                "action": "next_step"
-            }
-        elif "skip" in user_input:
-            return {
-                "response": "Skipped. What would you like to do?",
-                "action": "none"
-            }
-        elif "pause" in user_input or "wait" in user_input:
-            return {
-                "response": "Paused. Say 'continue' when ready.",
-                "action": "pause"
-            }
-        elif "resume" in user_input or "continue" in user_input:
-            return {
-                "response": "Continuing where we left off.",
-                "action": "resume"
-            }
-        elif "repeat" in user_input or "again" in user_input:
-            return {
-                "response": "Repeating current step.",
-                "action": "repeat_step"
-            }
-        elif "dropped" in user_input or "fell" in user_input or "disaster" in user_input:
-            return {
-                "response": "No worries! Kitchen accidents happen. Need to restart this step?",
-                "action": "pause"
-            }
-        elif "help" in user_input or "stuck" in user_input:
-            return {
-                "response": "I'm here to help! What's the problem?",
-                "action": "none"
-            }
-        elif "stop" in user_input or "quit" in user_input or "exit" in user_input:
-            return {
-                "response": "Thanks for cooking with me!",
-                "action": "complete_recipe"
-            }
-        else:
-            return {
-                "response": "Got it. Say 'help', 'next', or 'pause' as needed.",
-                "action": "none"
-            }
+    # Intent responses at class scope, shared between synonymous keywords;
+    # dispatch is one dict probe per token instead of ~10 substring scans
+    _RESP_START = {
+        "response": "Perfect! Let's start cooking. First, season the ground beef in a large bowl.",
+        "action": "next_step"
+    }
+    _RESP_NEXT = {"response": "Great job! Moving to the next step.", "action": "next_step"}
+    _RESP_SKIP = {"response": "Skipped. What would you like to do?", "action": "none"}
+    _RESP_PAUSE = {"response": "Paused. Say 'continue' when ready.", "action": "pause"}
+    _RESP_RESUME = {"response": "Continuing where we left off.", "action": "resume"}
+    _RESP_REPEAT = {"response": "Repeating current step.", "action": "repeat_step"}
+    _RESP_DISASTER = {
+        "response": "No worries! Kitchen accidents happen. Need to restart this step?",
+        "action": "pause"
+    }
+    _RESP_HELP = {"response": "I'm here to help! What's the problem?", "action": "none"}
+    _RESP_STOP = {"response": "Thanks for cooking with me!", "action": "complete_recipe"}
+    _RESP_DEFAULT = {
+        "response": "Got it. Say 'help', 'next', or 'pause' as needed.",
+        "action": "none"
+    }
+
+    _INTENT_TABLE = {
+        "start": _RESP_START, "begin": _RESP_START,
+        "next": _RESP_NEXT, "done": _RESP_NEXT, "ready": _RESP_NEXT,
+        "skip": _RESP_SKIP,
+        "pause": _RESP_PAUSE, "wait": _RESP_PAUSE,
+        "resume": _RESP_RESUME, "continue": _RESP_RESUME,
+        "repeat": _RESP_REPEAT, "again": _RESP_REPEAT,
+        "dropped": _RESP_DISASTER, "fell": _RESP_DISASTER,
+        "disaster": _RESP_DISASTER,
+        "help": _RESP_HELP, "stuck": _RESP_HELP,
+        "stop": _RESP_STOP, "quit": _RESP_STOP, "exit": _RESP_STOP,
+    }
+
+    def mock_ai_response(self, user_input: str, session: CookingSession, recipe: Recipe,
+                         user_input_lower: str = None):
+        """Mock AI response with shorter, more natural responses.
+
+        Callers that already lowercased the input pass it via
+        user_input_lower to skip the re-allocation here.
+        """
+        low = user_input_lower if user_input_lower is not None else user_input.lower()
+        for token in low.split():
+            response = self._INTENT_TABLE.get(token.strip(".,!?'"))
+            if response:
+                return response
+        return self._RESP_DEFAULT
     
-    def demo_voice_cooking(self):
+    async def demo_voice_cooking(self):
         """Run the improved voice cooking demo"""
-        
-        self.speak_interruptible("Welcome to Foodingo! Your AI cooking assistant.")
-        
-        # Get the burger recipe
+
+        await self.speak_interruptible("Welcome to Foodingo! Your AI cooking assistant.")
+
+        # Get the burger recipe (loads while the welcome line plays)
         recipe = get_recipe("classic_beef_burger")
         if not recipe:
-            self.speak_interruptible("Sorry, couldn't load the recipe.")
+            await self.speak_interruptible("Sorry, couldn't load the recipe.")
             return
-        
-        self.speak_interruptible(f"Today we're making {recipe.name}. Ready to start?")
+
+        await self.speak_interruptible(f"Today we're making {recipe.name}. Ready to start?")
         
         # Monkey patch the AI response for demo
         self.cooking_service.conversation_engine.generate_response = self.mock_ai_response
@@ -314,62 +676,91 @@ class VoiceCookingAssistant:
         print("   • 'I dropped something' - Handle disasters")
         print("   • 'help' - Get assistance")
         
+        # Loop invariants hoisted: the step list never changes, and the
+        # current step object only needs re-resolving when the index moves
+        steps = recipe.steps
+        n_steps = recipe.step_count
+        last_idx = None
+        current_step = None
+
+        # Commands that only control speech/UI never need the cooking
+        # service; dispatching them locally skips the whole
+        # process_user_input round-trip on the most common interrupts
+        local_actions = {"skip": self.stop_speaking}
+
         while True:
             # Show current status
-            current_step = session.get_current_step(recipe)
+            current_idx = session.current_step
+            if current_idx != last_idx:
+                current_step = steps[current_idx] if 0 <= current_idx < n_steps else None
+                last_idx = current_idx
             if current_step:
-                step_info = f"Step {session.current_step + 1}/{len(recipe.steps)}"
-                print(f"\n📍 {step_info}")
+                print(f"\n📍 Step {current_idx + 1}/{n_steps}")
                 print(f"📝 {current_step.instruction}")
-                
+
                 if current_step.tips:
                     print(f"💡 {current_step.tips[0]}")
             else:
-                self.speak_interruptible("Recipe complete! Enjoy your burgers!")
+                await self.speak_interruptible("Recipe complete! Enjoy your burgers!")
                 break
             
+            # Render the next step's intro while waiting on the user
+            self._prefetch_step_audio(recipe, current_idx + 1)
+
             # Get user input with fast response
             try:
-                user_input = self.get_input_fast()
+                user_input = await self.get_input_fast()
                 
                 if not user_input:
                     continue
-                
-                if user_input.lower() in ['quit', 'exit', 'stop']:
-                    self.speak_interruptible("Thanks for cooking!")
+
+                # Lowercase once per turn; every check below reuses it
+                ui_lower = user_input.lower()
+
+                # Pure-local fast path, keyed by the first spoken token
+                handler = local_actions.get(ui_lower.split()[0])
+                if handler:
+                    handler()
+                    continue
+
+                if ui_lower in _QUIT_SET:
+                    await self.speak_interruptible("Thanks for cooking!")
                     break
-                
-                # Process input
-                result = self.cooking_service.process_user_input(
+
+                # Process input on the same loop; the previous utterance's
+                # tail may still be playing while this runs
+                result = await self.cooking_service.process_user_input(
                     session_id=session.session_id,
                     user_input=user_input,
                     recipe=recipe
                 )
-                
-                # Speak the response (interruptible)
-                self.speak_interruptible(result['response'])
-                
-                if result.get('session_update', {}).get('step_introduction'):
-                    self.speak_interruptible(result['session_update']['step_introduction'])
-                
+
+                # One utterance per turn: response and step introduction
+                # coalesced so the TTS pipeline is entered once
+                response = result['response']
+                intro = result.get('session_update', {}).get('step_introduction')
+                if intro:
+                    response = f"{response} {intro}"
+                await self.speak_interruptible(response)
+
                 # Check completion
-                if session.current_step >= len(recipe.steps):
-                    self.speak_interruptible("Perfect! Recipe completed!")
+                if session.current_step >= n_steps:
+                    await self.speak_interruptible("Perfect! Recipe completed!")
                     break
                     
             except KeyboardInterrupt:
                 self.stop_speaking()
-                self.speak_interruptible("Cooking ended. Thanks!")
+                await self.speak_interruptible("Cooking ended. Thanks!")
                 break
             except Exception as e:
                 print(f"❌ Error: {e}")
-                self.speak_interruptible("Technical issue. Let's continue.")
+                await self.speak_interruptible("Technical issue. Let's continue.")
 
 def main():
     """Main function"""
     try:
         assistant = VoiceCookingAssistant()
-        assistant.demo_voice_cooking()
+        asyncio.run(assistant.demo_voice_cooking())
     except ImportError as e:
         print(f"❌ Missing package: {e}")
         print("Install: pip install pyttsx3 pyaudio")
@@ -4,11 +4,16 @@ Kitchen-optimized voice demo with continuous listening and noise filtering
 """
 
 import sys
+import asyncio
+import hashlib
+import json
 import os
+import re
 import threading
 import time
 import queue
 import select
+import selectors
 import signal
 import atexit
 import termios
@@ -16,10 +21,93 @@ import tty
 import speech_recognition as sr
 import pyttsx3
 import subprocess
-from collections import deque
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+# Local speech recognition is optional; without faster-whisper installed
+# the demo keeps using the Google Web Speech API
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+# Neural VAD gating is optional; without torch installed the energy
+# threshold alone decides what reaches the recognizer
+try:
+    import torch
+except ImportError:
+    torch = None
+
+# Real-time denoising is optional; without DeepFilterNet the raw
+# capture goes straight to the VAD/recognizer
+try:
+    from df.enhance import enhance, init_df
+except ImportError:
+    enhance = init_df = None
+
+# Semantic duplicate filtering is optional; without
+# sentence-transformers only exact repeats are caught
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+# Sentence boundaries for synthesis pipelining; a simple split keeps
+# nltk out of the dependency list
+_SENT_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+def _split_sentences(text):
+    """Split text at sentence boundaries, punctuation kept attached."""
+    return _SENT_RE.split(text)
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Every canned line the demo can speak. mock_ai_response only ever
+# returns from this fixed set, so pre-rendering them at startup turns
+# each later speak into a disk read instead of a synthesis run
+_CANNED_PHRASES = (
+    "Welcome to Foodingo! Your kitchen AI assistant.",
+    "Sorry, couldn't load the recipe.",
+    "Okay, stopped talking.",
+    "Perfect! Let's start cooking. First, season the ground beef in a large bowl.",
+    "Great job! Moving to the next step.",
+    "Paused. Say continue when ready.",
+    "Continuing where we left off.",
+    "Repeating current step.",
+    "No worries! Kitchen accidents happen. Need to restart this step?",
+    "I'm here to help! What's the problem?",
+    "Thanks for cooking with me!",
+    "Got it. Say help, next, or pause as needed.",
+    "Recipe complete! Enjoy your burgers!",
+    "Thanks for cooking!",
+    "Perfect! Recipe completed!",
+    "Cooking ended. Thanks!",
+)
+
+# Bounded cache: beyond this many rendered phrases, the least recently
+# spoken files are deleted
+_TTS_CACHE_MAX = 256
+
+# Saved microphone calibration: for a given mic and room the ambient
+# level is nearly constant between sessions, so the 3s calibration only
+# needs rerunning when the device changes or the snapshot goes stale
+_MIC_CAL_PATH = Path("~/.foodingo/mic_calibration.json").expanduser()
+_MIC_CAL_MAX_AGE = 7 * 24 * 3600  # Recalibrate weekly
+
+# Recognition fillers dropped when normalizing an utterance for the
+# intent cache: "uh next" and "next" are the same request
+_FILLER_WORDS = frozenset(('uh', 'um', 'er', 'please'))
+_INTENT_CACHE_MAX = 128
+
+# Flag bits produced by classify_command's single vocabulary scan
+_F_INTERRUPT = 1   # Word that cuts AI speech short
+_F_ALWAYS_VALID = 2  # Interrupt/emergency vocab: never filtered
+_F_COMMAND = 4     # Wake or command vocab
+
 from models import Recipe, CookingSession, StepStatus
 from services.cooking_service import CookingService
 from data.sample_recipes import get_recipe
@@ -37,7 +125,22 @@ class KitchenVoiceAssistant:
             print(f"❌ TTS error: {e}")
             self.tts = None
         
+        # Silero VAD gates the recognizer: most captured kitchen chunks
+        # are clatter, and a sub-millisecond probability check is far
+        # cheaper than a transcription call on noise
+        self._vad = None
+        if torch is not None:
+            try:
+                self._vad, _ = torch.hub.load(
+                    'snakers4/silero-vad', 'silero_vad', trust_repo=True
+                )
+                print("🧠 Neural VAD loaded")
+            except Exception as e:
+                print(f"⚠️  VAD unavailable ({e}), relying on energy threshold")
+
         # Initialize speech recognition for noisy environments
+        self._df_model = None
+        self._df_state = None
         try:
             self.recognizer = sr.Recognizer()
             self.microphone = sr.Microphone()
@@ -46,19 +149,49 @@ class KitchenVoiceAssistant:
         except Exception as e:
             print(f"❌ Microphone error: {e}")
             self.microphone = None
-        
+
+        # Local int8 Whisper when available: no network round-trip (or
+        # RequestError flakiness) per utterance, and its VAD filter
+        # drops silent kitchen audio before any decoding happens
+        self._asr = None
+        if WhisperModel is not None:
+            try:
+                self._asr = WhisperModel("tiny.en", device="cpu", compute_type="int8")
+                print("🧠 Using local Whisper for speech recognition")
+            except Exception as e:
+                print(f"⚠️  Local Whisper unavailable ({e}), using Google STT")
+
         # Initialize cooking service
         self.cooking_service = CookingService()
         
         # Continuous listening control
         self.listening_active = False
         self.listen_thread = None
-        self.voice_queue = queue.Queue()
+        self._listener_running = False
+        self._mic_source = None
+        # Single producer, single consumer: a bare deque (append/popleft
+        # are atomic in CPython) avoids Queue's double lock round-trip
+        # per operation
+        self.voice_queue = deque()
+        # Wakeup pipe: the listener writes a byte when it queues a command
+        # so the main loop can block in select() instead of spin-polling
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        # Both input fds registered once with the kernel (kqueue/epoll);
+        # each poll reuses that state instead of rebuilding select()'s
+        # fd sets, and one call waits on typing and voice together
+        self._input_sel = selectors.DefaultSelector()
+        self._input_sel.register(sys.stdin, selectors.EVENT_READ)
+        self._input_sel.register(self._wakeup_r, selectors.EVENT_READ)
         
-        # Speech control with proper interruption
+        # Speech control with proper interruption: one long-lived worker
+        # owns playback, so utterances are enqueued rather than each
+        # paying a thread create/join cycle
         self.currently_speaking = False
         self.speech_interrupted = False
-        self.speech_thread = None
+        self._tts_queue = queue.Queue()
+        self._play_proc = None
+        self._tts_thread = threading.Thread(target=self._tts_worker, daemon=True)
+        self._tts_thread.start()
         
         # Spacebar interrupt system
         self.spacebar_monitoring = False
@@ -67,10 +200,58 @@ class KitchenVoiceAssistant:
         # Kitchen-specific settings
         self.wake_words = ['hey', 'foodingo', 'assistant', 'kitchen', 'cooking']
         self.command_words = ['start', 'next', 'pause', 'continue', 'help', 'repeat', 'stop', 'skip', 'done', 'ready', 'begin']
+        self.interrupt_words = ['stop', 'skip', 'quiet', 'silence', 'hey', 'foodingo', 'assistant', 'help']
+        self.emergency_words = ['dropped', 'fell', 'disaster', 'mess', 'fire', 'burn', 'emergency']
+
+        # Vocabulary compiled once into a single word->flags table plus
+        # one alternation: classification is then one C-speed scan per
+        # utterance instead of four Python substring loops
+        self._word_flags = {}
+        for word in self.wake_words + self.command_words:
+            self._word_flags[word] = self._word_flags.get(word, 0) | _F_COMMAND
+        for word in self.interrupt_words + self.emergency_words:
+            self._word_flags[word] = self._word_flags.get(word, 0) | _F_ALWAYS_VALID
+        # Words that cut AI speech short ('help' asks a question, it
+        # shouldn't silence the answer in progress)
+        for word in ('stop', 'skip', 'quiet', 'silence', 'hey', 'foodingo', 'assistant'):
+            self._word_flags[word] |= _F_INTERRUPT
+        self._vocab_re = re.compile(
+            r'\b(' + '|'.join(map(re.escape, self._word_flags)) + r')\b'
+        )
         
         # Recent speech buffer to avoid duplicates
         self.recent_speech = deque(maxlen=3)
-        
+
+        # Intent cache for stateless head queries: repeated help/chatter
+        # utterances at the same step skip the full service round-trip
+        self._intent_cache = OrderedDict()
+
+        # Embedding-based near-duplicate filter: "uh next" and "next"
+        # are the same re-recognized command even though the exact-match
+        # buffer above can't see it. ~5ms per utterance on CPU
+        self._embed = None
+        self._recent_embeds = deque(maxlen=5)
+        if SentenceTransformer is not None:
+            try:
+                self._embed = SentenceTransformer('all-MiniLM-L6-v2')
+                print("🧠 Semantic duplicate filter active")
+            except Exception as e:
+                print(f"⚠️  Semantic filter unavailable ({e})")
+
+        # Rendered-audio cache: repeated phrases play from disk instead
+        # of paying fork/exec plus synthesis on every speak
+        self._tts_cache_dir = Path("~/.foodingo/tts_cache").expanduser()
+        self._tts_cache_dir.mkdir(parents=True, exist_ok=True)
+        self._tts_lru = OrderedDict()
+        # Renders sentence i+1 while sentence i plays, so first audio
+        # lands after one sentence's synthesis regardless of text length
+        self._render_pool = ThreadPoolExecutor(max_workers=2)
+        threading.Thread(target=self._prewarm_tts_cache, daemon=True).start()
+
+        # Idempotence guard: signal handling exits through atexit, which
+        # would otherwise run cleanup a second time
+        self._cleaned = threading.Event()
+
         # Register cleanup handlers
         self.setup_cleanup_handlers()
     
@@ -90,7 +271,14 @@ class KitchenVoiceAssistant:
         sys.exit(0)
     
     def cleanup(self):
-        """Clean up all resources and threads"""
+        """Clean up all resources and threads (runs at most once)"""
+        # Ctrl+C goes signal_handler -> cleanup -> sys.exit -> atexit ->
+        # cleanup again; the second pass would redo the thread joins and
+        # process kills for nothing
+        if self._cleaned.is_set():
+            return
+        self._cleaned.set()
+
         print("🧹 Cleaning up voice assistant...")
         
         try:
@@ -105,15 +293,11 @@ class KitchenVoiceAssistant:
                 self.tts.stop()
                 time.sleep(0.2)
             
-            # Kill any running say processes
-            subprocess.run(['killall', 'say'], check=False)
+            # Kill our own playback process, if one is running
+            self._stop_playback()
             
             # Clear speech queue
-            while not self.voice_queue.empty():
-                try:
-                    self.voice_queue.get_nowait()
-                except queue.Empty:
-                    break
+            self.voice_queue.clear()
             
             print("✅ Cleanup complete")
             
@@ -201,14 +385,38 @@ class KitchenVoiceAssistant:
             
         try:
             print("🔧 Calibrating for kitchen noise...")
-            
-            # Extended calibration for kitchen environment
-            with self.microphone as source:
-                print("   (Calibrating for background noise - let kitchen run normally)")
-                self.recognizer.adjust_for_ambient_noise(source, duration=3)
-            
-            # Kitchen-optimized settings
-            self.recognizer.energy_threshold = 400  # Higher threshold for noisy kitchen
+
+            if self._vad is None:
+                saved = self._load_mic_calibration()
+                if saved is not None:
+                    # Same mic, recent snapshot: skip the 3s block
+                    self.recognizer.energy_threshold = saved
+                    print(f"✅ Loaded saved calibration (threshold {saved:.0f})")
+                else:
+                    # Extended calibration for kitchen environment
+                    with self.microphone as source:
+                        print("   (Calibrating for background noise - let kitchen run normally)")
+                        self.recognizer.adjust_for_ambient_noise(source, duration=3)
+                    # Higher threshold for noisy kitchen
+                    self.recognizer.energy_threshold = 400
+                    self._save_mic_calibration()
+            else:
+                # The VAD decides speech vs noise downstream, so capture
+                # can skip the 3s calibration and use a lower threshold
+                # that still catches quiet speech
+                print("   (VAD gating active - skipping long calibration)")
+                self.recognizer.energy_threshold = 300
+
+            # Neural denoising cleans transient clatter the energy
+            # threshold can't distinguish from speech; with a clean
+            # signal, much quieter speech survives capture
+            if init_df is not None and torch is not None:
+                try:
+                    self._df_model, self._df_state, _ = init_df()
+                    self.recognizer.energy_threshold = 100
+                    print("🧠 Noise suppression active")
+                except Exception as e:
+                    print(f"⚠️  Noise suppression unavailable ({e})")
             self.recognizer.dynamic_energy_threshold = True
             self.recognizer.pause_threshold = 1.0  # Longer pause for kitchen speech
             self.recognizer.phrase_time_limit = 8  # Reasonable phrase length
@@ -218,6 +426,138 @@ class KitchenVoiceAssistant:
         except Exception as e:
             print(f"⚠️  Microphone setup: {e}")
     
+    def _normalize(self, text):
+        """Canonical utterance form for caching: lowercase, no fillers."""
+        return " ".join(
+            word for word in text.lower().split() if word not in _FILLER_WORDS
+        )
+
+    def _load_mic_calibration(self):
+        """Return the saved energy threshold for this device, or None
+        when the snapshot is missing, stale, or for a different mic."""
+        try:
+            with open(_MIC_CAL_PATH) as f:
+                cal = json.load(f)
+            if (cal.get("device_index") == self.microphone.device_index
+                    and time.time() - cal.get("ts", 0) < _MIC_CAL_MAX_AGE):
+                return cal["energy_threshold"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+    def _save_mic_calibration(self):
+        """Snapshot the calibration so the next run can skip it."""
+        try:
+            _MIC_CAL_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(_MIC_CAL_PATH, "w") as f:
+                json.dump({
+                    "device_index": self.microphone.device_index,
+                    "energy_threshold": self.recognizer.energy_threshold,
+                    "ts": time.time(),
+                }, f)
+        except OSError:
+            pass  # Next run just recalibrates
+
+    def _tts_cached(self, text):
+        """Return rendered audio for text, synthesizing only on a miss.
+
+        Hits just touch the LRU and hand back the file; misses render
+        once with 'say -o'. Evicted entries are removed from disk so the
+        cache stays bounded across runs.
+        """
+        key = hashlib.sha1(text.encode()).hexdigest()
+        path = self._tts_cache_dir / f"{key}.aiff"
+        if key in self._tts_lru:
+            self._tts_lru.move_to_end(key)
+            return path
+        if not path.exists():
+            subprocess.run(
+                ['say', '-o', str(path), '--data-format=LEF32@22050', text],
+                timeout=20, check=False
+            )
+        self._tts_lru[key] = path
+        while len(self._tts_lru) > _TTS_CACHE_MAX:
+            _, old = self._tts_lru.popitem(last=False)
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+        return path
+
+    def _prewarm_recipe_audio(self, recipe):
+        """Render every step prompt once the recipe is known.
+
+        The step introductions and instructions are fixed as soon as the
+        session starts, so a daemon thread synthesizes them into the
+        audio cache while the user is cooking; each step transition then
+        costs only an afplay start instead of a full render.
+        """
+        def _render():
+            try:
+                for text in (
+                    *recipe.step_intros,
+                    *(step.instruction for step in recipe.steps),
+                ):
+                    for sentence in _split_sentences(text):
+                        self._tts_cached(sentence)
+            except Exception:
+                pass  # Misses just synthesize on demand
+
+        threading.Thread(target=_render, daemon=True).start()
+
+    def _prewarm_tts_cache(self):
+        """Render every canned phrase in the background at startup.
+
+        Rendered per sentence, matching the granularity the playback
+        worker looks up.
+        """
+        try:
+            for phrase in _CANNED_PHRASES:
+                for sentence in _split_sentences(phrase):
+                    self._tts_cached(sentence)
+        except Exception:
+            pass  # Cache misses just synthesize on demand later
+
+    def _tts_worker(self):
+        """Long-lived playback worker draining the utterance queue.
+
+        Owning playback in one thread means speak_interruptible never
+        creates a thread per call, and back-to-back utterances (response
+        then step introduction) queue without a join cycle in between.
+        Each job's done event is set when its audio finishes or is
+        killed by an interrupt.
+        """
+        while True:
+            text, done = self._tts_queue.get()
+            try:
+                if self.speech_interrupted:
+                    continue  # Drain whatever was queued behind the interrupt
+
+                # Pipeline: all sentence renders are submitted up front,
+                # so sentence i+1 synthesizes while sentence i plays and
+                # first audio costs only the first sentence's render
+                sentences = _split_sentences(text)
+                renders = [
+                    self._render_pool.submit(self._tts_cached, sentence)
+                    for sentence in sentences
+                ]
+                for sentence, fut in zip(sentences, renders):
+                    if self.speech_interrupted:
+                        for pending in renders:
+                            pending.cancel()
+                        break
+                    cache_path = fut.result()
+                    if cache_path.exists():
+                        self._play_proc = subprocess.Popen(['afplay', str(cache_path)])
+                    else:
+                        self._play_proc = subprocess.Popen(['say', sentence])
+                    self._play_proc.wait()
+            except Exception as e:
+                print(f"⚠️  Speech worker error: {e}")
+            finally:
+                done.set()
+                self._tts_queue.task_done()
+
     def speak_interruptible(self, text):
         """Speak with spacebar interrupt capability"""
         print(f"\n🤖 AI: {text}")
@@ -228,39 +568,27 @@ class KitchenVoiceAssistant:
             self.currently_speaking = True
             self.speech_interrupted = False
             
-            # COMPLETELY stop voice listening to prevent ANY feedback
+            # Mute voice listening to prevent feedback; the flag flip is
+            # enough — the done event below is a real playback-endpoint
+            # barrier, so no padding sleep is needed on either side
             listening_was_active = self.listening_active
             if listening_was_active:
                 self.listening_active = False
-                time.sleep(1.0)  # Longer pause to ensure complete stop
             
             # Start spacebar monitoring ONLY during speech
             self.start_spacebar_monitoring()
             
-            # Start speech in background
-            import threading
-            def speak_background():
-                try:
-                    subprocess.run(['say', text], timeout=20, check=False)
-                except Exception as e:
-                    print(f"⚠️  Say command error: {e}")
-            
-            speech_thread = threading.Thread(target=speak_background)
-            speech_thread.daemon = True
-            speech_thread.start()
-            
-            # Monitor for completion or interruption
-            while speech_thread.is_alive() and not self.speech_interrupted:
-                time.sleep(0.1)
-            
-            # If interrupted, make sure speech stops
+            # Hand the utterance to the persistent worker and wait for
+            # its done event; an interrupt kills the playback process,
+            # which resolves the event almost immediately
+            done = threading.Event()
+            self._tts_queue.put((text, done))
+            done.wait(timeout=25)
+
             if self.speech_interrupted:
-                subprocess.run(['killall', 'say'], check=False)
+                self._stop_playback()
                 print("🛑 Speech interrupted by spacebar")
             
-            # Wait for speech thread to finish
-            speech_thread.join(timeout=2)
-            
         except Exception as e:
             print(f"⚠️  Speech error: {e}")
         finally:
@@ -268,19 +596,36 @@ class KitchenVoiceAssistant:
             # ALWAYS stop spacebar monitoring after speech
             self.stop_spacebar_monitoring()
             
-            # EXTENDED pause before resuming listening to prevent feedback
+            # The done event already marked the playback endpoint; the
+            # listener thread keeps draining the mic stream while muted,
+            # so one short pause for the hardware buffer is all that's
+            # needed before handing the mic back
             if listening_was_active:
-                print("🔇 Clearing audio buffer...")
-                time.sleep(2.0)  # Much longer pause
+                time.sleep(0.15)
                 self.listening_active = True
                 print("🎧 Voice listening resumed")
             
             print("─" * 50)
     
+    def _stop_playback(self):
+        """Terminate the in-flight playback process, if any.
+
+        One targeted kill() on the PID we spawned — microseconds,
+        versus killall's process-table scan plus fork/exec, and no
+        racing other say/afplay processes on the system.
+        """
+        proc = self._play_proc
+        if proc is not None and proc.poll() is None:
+            try:
+                proc.terminate()
+            except Exception:
+                pass
+
     def interrupt_speech(self):
         """Interrupt current speech"""
         if self.currently_speaking:
             self.speech_interrupted = True
+            self._stop_playback()
             if self.tts:
                 try:
                     self.tts.stop()
@@ -313,15 +658,22 @@ class KitchenVoiceAssistant:
             spacebar_pressed = False  # Prevent spam
             
             while self.spacebar_monitoring:
-                if select.select([sys.stdin], [], [], 0.1)[0]:
+                ready = [
+                    key.fileobj for key, _ in self._input_sel.select(timeout=0.1)
+                ]
+                # Drain listener wakeups so a queued voice command can't
+                # spin this loop; the main loop re-checks its deque
+                # before every wait, so nothing is lost
+                if self._wakeup_r in ready:
+                    os.read(self._wakeup_r, 4096)
+                if sys.stdin in ready:
                     char = sys.stdin.read(1)
                     if char == ' ' and not spacebar_pressed:  # Spacebar pressed (prevent spam)
                         spacebar_pressed = True
                         if self.currently_speaking:
                             print("\n⏸️  SPACEBAR INTERRUPT!")
+                            # interrupt_speech terminates the playback PID
                             self.interrupt_speech()
-                            # Kill the say process immediately
-                            subprocess.run(['killall', 'say'], check=False)
                             break  # Exit monitoring after interrupt
                         else:
                             print("\n🔘 Spacebar pressed (no speech to interrupt)")
@@ -342,80 +694,181 @@ class KitchenVoiceAssistant:
     
 
     
-    def is_valid_command(self, text):
-        """Check if speech contains valid commands (filter kitchen noise and self-speech)"""
+    def classify_command(self, text):
+        """Validate one utterance and classify its vocabulary in one pass.
+
+        Returns (is_valid, text_lower, flags): the utterance is lowercased
+        once and the combined vocabulary regex is scanned once, with every
+        matched word OR-ing its flag bits in. Callers branch on the bitmap
+        instead of re-lowering and re-scanning the text.
+        """
         text_lower = text.lower()
-        
-        # Must contain a wake word or command word
-        has_wake_word = any(wake in text_lower for wake in self.wake_words)
-        has_command = any(cmd in text_lower for cmd in self.command_words)
-        
-        print(f"🔍 Debug: Validating '{text}'")
-        print(f"🔍 Debug: Has wake word: {has_wake_word}")
-        print(f"🔍 Debug: Has command: {has_command}")
-        print(f"🔍 Debug: Word count: {len(text.split())}")
-        
+        flags = 0
+        for m in self._vocab_re.finditer(text_lower):
+            flags |= self._word_flags[m.group(1)]
+
         # Note: Self-speech filtering is now handled by muting during speech
-        
+
         # ALWAYS allow interruption commands, even during AI speech
-        interrupt_words = ['stop', 'skip', 'quiet', 'silence', 'hey', 'foodingo', 'assistant', 'help']
-        emergency_words = ['dropped', 'fell', 'disaster', 'mess', 'fire', 'burn', 'emergency']
-        
-        if any(word in text_lower for word in interrupt_words + emergency_words):
+        if flags & _F_ALWAYS_VALID:
             print(f"🔍 Debug: Approved - Interruption/emergency command detected")
-            return True
-        
+            return True, text_lower, flags
+
         # Filter out very short or gibberish
-        if len(text.split()) < 1:
+        word_count = len(text.split())
+        if word_count < 1:
             print(f"🔍 Debug: Rejected - too short")
-            return False
-        
+            return False, text_lower, flags
+
         # Filter out repeated recent speech
         if text in self.recent_speech:
             print(f"🔍 Debug: Rejected - duplicate recent speech")
-            return False
-        
-        result = has_wake_word or has_command or len(text.split()) >= 2
-        print(f"🔍 Debug: Final validation result: {result}")
-        return result
+            return False, text_lower, flags
+
+        # Filter near-duplicates the exact match misses (filler words,
+        # recognition jitter) by cosine similarity against the last few
+        # utterances; vectors are normalized, so the dot is the cosine
+        if self._embed is not None:
+            v = self._embed.encode(text, normalize_embeddings=True)
+            if self._recent_embeds and max(
+                float(v @ e) for _, e in self._recent_embeds
+            ) > 0.92:
+                print(f"🔍 Debug: Rejected - semantic duplicate")
+                return False, text_lower, flags
+            self._recent_embeds.append((text, v))
+
+        result = bool(flags & _F_COMMAND) or word_count >= 2
+        print(f"🔍 Debug: Validation result for '{text}': {result}")
+        return result, text_lower, flags
+
+    def is_valid_command(self, text):
+        """Check if speech contains valid commands (filter kitchen noise and self-speech)"""
+        valid, _, _ = self.classify_command(text)
+        return valid
     
 
     
+    def _denoise(self, audio):
+        """Run a captured chunk through DeepFilterNet before VAD/ASR.
+
+        The model works at its native 48kHz; the chunk is resampled in,
+        enhanced, and handed back as AudioData so the rest of the
+        pipeline is oblivious. Any failure returns the raw capture.
+        """
+        if self._df_model is None:
+            return audio
+        try:
+            samples = np.frombuffer(
+                audio.get_raw_data(convert_rate=48000, convert_width=2),
+                dtype=np.int16
+            ).astype(np.float32) / 32768.0
+            cleaned = enhance(
+                self._df_model, self._df_state, torch.from_numpy(samples).unsqueeze(0)
+            )
+            pcm = (
+                cleaned.squeeze(0).numpy().clip(-1.0, 1.0) * 32767
+            ).astype(np.int16).tobytes()
+            return sr.AudioData(pcm, 48000, 2)
+        except Exception:
+            return audio  # Raw capture is still usable
+
+    def _has_speech(self, audio):
+        """Cheap speech/no-speech gate ahead of transcription.
+
+        Feeds 32ms windows to the Silero model and bails out on the
+        first one that crosses the speech threshold; chunks that never
+        do (the vast majority in a kitchen) never reach the recognizer.
+        """
+        if self._vad is None:
+            return True
+        try:
+            samples = np.frombuffer(
+                audio.get_raw_data(convert_rate=16000, convert_width=2),
+                dtype=np.int16
+            ).astype(np.float32) / 32768.0
+            # 512-sample windows are the model's native 16kHz frame
+            for start in range(0, len(samples) - 512, 512):
+                window = torch.from_numpy(samples[start:start + 512])
+                if self._vad(window, 16000).item() > 0.5:
+                    return True
+            return False
+        except Exception:
+            return True  # Fail open: let the recognizer decide
+
+    def _transcribe(self, audio):
+        """Transcribe one utterance, locally when Whisper is loaded.
+
+        The int8 tiny.en model decodes a short command in well under
+        real time on CPU with no network dependence; vad_filter skips
+        silent chunks before any decoding happens. Falls back to the
+        Google Web Speech API when faster-whisper isn't installed.
+        """
+        if self._asr is not None:
+            samples = np.frombuffer(
+                audio.get_raw_data(convert_rate=16000, convert_width=2),
+                dtype=np.int16
+            ).astype(np.float32) / 32768.0
+            segments, _ = self._asr.transcribe(
+                samples, language="en", beam_size=1, vad_filter=True
+            )
+            return " ".join(segment.text.strip() for segment in segments).strip()
+        return self.recognizer.recognize_google(audio, show_all=False)
+
     def continuous_listen(self):
-        """Continuously listen for voice commands in kitchen environment"""
+        """Continuously listen for voice commands in kitchen environment.
+
+        The PortAudio stream opened by start_continuous_listening stays
+        live for the thread's whole life; listening_active only gates
+        whether captured audio is processed, so muting during TTS no
+        longer pays a ~100ms stream close/reopen per cycle.
+        """
         print("🎤 Starting continuous kitchen listening...")
-        
-        while self.listening_active:
+
+        while self._listener_running:
             try:
-                if not self.microphone:
-                    time.sleep(1)
+                if not self.listening_active:
+                    # Muted (AI speaking); drain the stream instead of
+                    # sleeping so PortAudio doesn't buffer our own speech
+                    # for the first listen() after unmute. The blocking
+                    # read also paces the loop at about one chunk period.
+                    try:
+                        self._mic_source.stream.read(self._mic_source.CHUNK)
+                    except Exception:
+                        time.sleep(0.05)
                     continue
-                
-                with self.microphone as source:
-                    # Short listen cycles to avoid blocking
-                    audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=6)
-                
+
+                # Short listen cycles on the persistent stream
+                audio = self.recognizer.listen(
+                    self._mic_source, timeout=1, phrase_time_limit=6
+                )
+
                 try:
+                    audio = self._denoise(audio)
+
+                    if not self._has_speech(audio):
+                        continue  # VAD: nothing but noise in the chunk
+
                     # Quick recognition
-                    text = self.recognizer.recognize_google(audio, show_all=False)
-                    
-                    if self.is_valid_command(text):
+                    text = self._transcribe(audio)
+                    if not text:
+                        continue  # Silence/noise only
+
+                    valid, text_lower, flags = self.classify_command(text)
+                    if valid:
                         print(f"👤 Heard: '{text}'")
                         print(f"🔍 Debug: Command validated as valid")
                         self.recent_speech.append(text)
-                        
-                        # Check for interruption commands first
-                        text_lower = text.lower()
+
                         # Wake words or explicit stop commands interrupt speech
-                        interrupt_words = ['stop', 'skip', 'quiet', 'silence', 'hey', 'foodingo', 'assistant']
-                        if any(word in text_lower for word in interrupt_words):
+                        if flags & _F_INTERRUPT:
                             print(f"🔍 Debug: Interruption word detected in '{text}'")
                             self.interrupt_speech()
                         
                         # Queue the command
                         print(f"🔍 Debug: Adding '{text}' to voice queue")
-                        self.voice_queue.put(text)
-                        print(f"🔍 Debug: Voice queue size now: {self.voice_queue.qsize()}")
+                        self.voice_queue.append(text)
+                        os.write(self._wakeup_w, b"\0")  # Wake the main loop
+                        print(f"🔍 Debug: Voice queue size now: {len(self.voice_queue)}")
                     else:
                         # Filtered out as noise
                         pass
@@ -424,8 +877,9 @@ class KitchenVoiceAssistant:
                     # Normal - lots of unclear audio in kitchen
                     pass
                 except sr.RequestError as e:
+                    # Google fallback path only; no backoff sleep — the
+                    # next listen() already paces the loop
                     print(f"⚠️  Recognition service error: {e}")
-                    time.sleep(2)
                     
             except sr.WaitTimeoutError:
                 # Normal - no speech detected
@@ -435,19 +889,33 @@ class KitchenVoiceAssistant:
                 time.sleep(1)
     
     def start_continuous_listening(self):
-        """Start background listening"""
-        if self.microphone and not self.listening_active:
+        """Start background listening on a persistent mic stream"""
+        if self.microphone and not self._listener_running:
+            if self._mic_source is None:
+                # Open PortAudio once for the listener's lifetime
+                self._mic_source = self.microphone.__enter__()
+            self._listener_running = True
             self.listening_active = True
             self.listen_thread = threading.Thread(target=self.continuous_listen)
             self.listen_thread.daemon = True
             self.listen_thread.start()
             print("🎧 Continuous listening started")
-    
+        elif self._listener_running:
+            # Thread already alive; just unmute
+            self.listening_active = True
+
     def stop_continuous_listening(self):
-        """Stop background listening"""
+        """Stop background listening and release the mic stream"""
+        self._listener_running = False
         self.listening_active = False
         if self.listen_thread:
             self.listen_thread.join(timeout=2)
+        if self._mic_source is not None:
+            try:
+                self.microphone.__exit__(None, None, None)
+            except Exception:
+                pass
+            self._mic_source = None
         print("🔇 Continuous listening stopped")
     
     def get_voice_command(self, timeout=15):
@@ -465,28 +933,36 @@ class KitchenVoiceAssistant:
         start_time = time.time()
         last_timer_update = 0
         
-        while time.time() - start_time < timeout:
-            try:
-                # Check for voice command
-                command = self.voice_queue.get_nowait()
-                return command
-            except queue.Empty:
-                # Check if user wants to type instead
-                if sys.stdin in select.select([sys.stdin], [], [], 0.1)[0]:
-                    typed_input = input("\n⌨️  Type: ").strip()
-                    if typed_input:
-                        return typed_input
-                
-                # Show cooking timer every 10 seconds
-                elapsed = time.time() - start_time
-                if elapsed - last_timer_update >= 10:
-                    remaining = int(timeout - elapsed)
-                    if remaining > 0:
-                        print(f"⏲️  Cooking time remaining: {remaining}s (say 'next' when ready)")
-                    last_timer_update = elapsed
-                
-                time.sleep(0.1)
-        
+        while True:
+            elapsed = time.time() - start_time
+            if elapsed >= timeout:
+                break
+
+            # Check for voice command; lock-free popleft on the deque
+            if self.voice_queue:
+                return self.voice_queue.popleft()
+
+            # Show cooking timer every 10 seconds
+            if elapsed - last_timer_update >= 10:
+                remaining = int(timeout - elapsed)
+                if remaining > 0:
+                    print(f"⏲️  Cooking time remaining: {remaining}s (say 'next' when ready)")
+                last_timer_update = elapsed
+
+            # Sleep in the kernel until the listener wakes us, the user
+            # types, or the next timer tick is due — no spin-polling
+            wait = min(timeout - elapsed, 10 - (elapsed - last_timer_update))
+            ready = [
+                key.fileobj
+                for key, _ in self._input_sel.select(timeout=max(wait, 0.05))
+            ]
+            if self._wakeup_r in ready:
+                os.read(self._wakeup_r, 4096)  # Drain wakeup bytes
+            if sys.stdin in ready:
+                typed_input = input("\n⌨️  Type: ").strip()
+                if typed_input:
+                    return typed_input
+
         print("⏱️  Cooking time complete! Continuing to next step...")
         return None
     
@@ -578,6 +1054,10 @@ class KitchenVoiceAssistant:
         print("🔍 Debug: Starting cooking session")
         session = self.cooking_service.start_cooking_session(recipe)
         print(f"🔍 Debug: Session started with ID: {session.session_id}")
+
+        # The whole recipe's audio is deterministic from here; render it
+        # in the background so step transitions play instantly
+        self._prewarm_recipe_audio(recipe)
         
         print("\n🍳 Kitchen Voice Commands:")
         print("   • 'start' - Begin cooking")
@@ -591,34 +1071,40 @@ class KitchenVoiceAssistant:
         
         print("🔍 Debug: About to enter main cooking loop")
         
+        # Step metadata transposed into parallel lists once up front;
+        # the loop then does plain index reads instead of re-walking
+        # step objects and their attributes every iteration
+        steps = recipe.steps
+        n_steps = len(steps)
+        instructions = [step.instruction for step in steps]
+        first_tips = [step.tips[0] if step.tips else None for step in steps]
+        est_mins = [step.estimated_time // 60 for step in steps]
+        # At least 30 seconds, up to 1/4 of estimated time
+        cooking_times = [max(30, step.estimated_time // 4) for step in steps]
+
         try:
             loop_count = 0
             while True:
                 loop_count += 1
                 print(f"🔍 Debug: Main loop iteration {loop_count}")
                 # Show current step
-                current_step = session.get_current_step(recipe)
-                if current_step:
-                    step_info = f"Step {session.current_step + 1} of {len(recipe.steps)}"
-                    print(f"\n📍 {step_info}")
-                    print(f"📝 {current_step.instruction}")
-                    
-                    if current_step.tips:
-                        print(f"💡 Tip: {current_step.tips[0]}")
-                    
+                idx = session.current_step
+                if 0 <= idx < n_steps:
+                    print(f"\n📍 Step {idx + 1} of {n_steps}")
+                    print(f"📝 {instructions[idx]}")
+
+                    if first_tips[idx]:
+                        print(f"💡 Tip: {first_tips[idx]}")
+
                     # Show estimated time for this step
-                    estimated_minutes = current_step.estimated_time // 60
-                    print(f"⏱️  Estimated time: {estimated_minutes} minutes")
+                    print(f"⏱️  Estimated time: {est_mins[idx]} minutes")
                 else:
                     self.speak_interruptible("Recipe complete! Enjoy your burgers!")
                     break
-                
+
                 # Give user time to actually cook - realistic timing
-                if current_step:
-                    cooking_time = max(30, current_step.estimated_time // 4)  # At least 30 seconds, up to 1/4 of estimated time
-                    print(f"🍳 Take your time cooking... (listening for {cooking_time}s)")
-                else:
-                    cooking_time = 30
+                cooking_time = cooking_times[idx]
+                print(f"🍳 Take your time cooking... (listening for {cooking_time}s)")
                 
                 # Get voice command with realistic timeout
                 user_input = self.get_voice_command(timeout=cooking_time)
@@ -634,14 +1120,28 @@ class KitchenVoiceAssistant:
                     self.speak_interruptible("Thanks for cooking!")
                     break
                 
-                # Process command
-                print(f"🔍 Debug: Sending to cooking service: '{user_input}'")
-                result = self.cooking_service.process_user_input(
-                    session_id=session.session_id,
-                    user_input=user_input,
-                    recipe=recipe
-                )
-                
+                # Stateless repeats skip the service entirely; anything
+                # that moves session state must always call through
+                cache_key = (self._normalize(user_input), session.current_step)
+                result = self._intent_cache.get(cache_key)
+                if result is not None:
+                    self._intent_cache.move_to_end(cache_key)
+                    print(f"🔍 Debug: Intent cache hit for '{user_input}'")
+                else:
+                    # Process command
+                    print(f"🔍 Debug: Sending to cooking service: '{user_input}'")
+                    result = asyncio.run(self.cooking_service.process_user_input(
+                        session_id=session.session_id,
+                        user_input=user_input,
+                        recipe=recipe
+                    ))
+                    # Only action-free results are safe to replay: they
+                    # have no session side effects to re-apply
+                    if result.get('action') == 'none':
+                        self._intent_cache[cache_key] = result
+                        while len(self._intent_cache) > _INTENT_CACHE_MAX:
+                            self._intent_cache.popitem(last=False)
+
                 print(f"🔍 Debug: Cooking service result: {result}")
                 
                 # Respond
@@ -654,7 +1154,7 @@ class KitchenVoiceAssistant:
                     self.speak_interruptible(result['session_update']['step_introduction'])
                 
                 # Check completion
-                if session.current_step >= len(recipe.steps):
+                if session.current_step >= n_steps:
                     time.sleep(0.5)
                     self.speak_interruptible("Perfect! Recipe completed!")
                     break